@@ -974,6 +974,10 @@ async def main():
         "--num-players", type=int, default=2, choices=[2, 3, 4],
         help="Number of players (default: 2)",
     )
+    parser.add_argument(
+        "--port", type=int, default=None,
+        help="Web server port (default: 19000 for A, 19001 for B, ...)",
+    )
     args = parser.parse_args()
 
     # Determine mode
@@ -983,7 +987,7 @@ async def main():
         game = UnoGame(args.game, args.player, args.num_players)
         await game.initialize()
 
-        port = PORT_MAP[args.player]
+        port = args.port or PORT_MAP[args.player]
         app = web.Application()
         app.router.add_get("/", web_handler)
         app.router.add_post("/play", play_handler)
@@ -0,0 +1,80 @@
+"""
+MCP client wrapper shared by the test scripts.
+
+Each MCPPlayer drives one player's main.py server process over stdio.
+"""
+
+import asyncio
+import os
+import sys
+from contextlib import AsyncExitStack
+
+from mcp.client.session import ClientSession
+from mcp.client.stdio import StdioServerParameters, get_default_environment, stdio_client
+
+PYTHON = sys.executable
+MAIN_PY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+
+def extract_text(result) -> str:
+    """Pull the text string out of a CallToolResult."""
+    return result.content[0].text
+
+
+def redis_url_env() -> dict[str, str] | None:
+    """Server environment that carries REDIS_URL through, or None if unset."""
+    if redis_url := os.environ.get("REDIS_URL"):
+        # stdio_client only passes a safe subset of the environment through
+        return {**get_default_environment(), "REDIS_URL": redis_url}
+    return None
+
+
+class MCPPlayer:
+    """Wraps an MCP client session connected to one player's server process.
+
+    The stdio client and session are entered and exited by a dedicated task
+    (anyio requires both to happen in the same task), so ``start`` and
+    ``stop`` can safely be awaited from ``asyncio.gather``.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.session: ClientSession | None = None
+        self._task: asyncio.Task | None = None
+        self._closing = asyncio.Event()
+
+    async def _serve(self, params: StdioServerParameters, started: asyncio.Future) -> None:
+        async with AsyncExitStack() as stack:
+            read_stream, write_stream = await stack.enter_async_context(
+                stdio_client(params)
+            )
+            self.session = await stack.enter_async_context(
+                ClientSession(read_stream, write_stream)
+            )
+            await self.session.initialize()
+            started.set_result(None)
+            await self._closing.wait()
+
+    async def start(self, game_id: str, player: str, *flags: str,
+                    env: dict[str, str] | None = None) -> None:
+        """Spawn main.py for *player* with any extra command-line *flags*."""
+        params = StdioServerParameters(
+            command=PYTHON,
+            args=[MAIN_PY, f"--game={game_id}", f"--player={player}", *flags],
+            env=env,
+        )
+        started = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._serve(params, started))
+        await asyncio.wait([started, self._task], return_when=asyncio.FIRST_COMPLETED)
+        if self._task.done():
+            # Startup failed; surface the error
+            self._task.result()
+
+    async def stop(self) -> None:
+        if self._task:
+            self._closing.set()
+            await self._task
+
+    async def call(self, tool: str, arguments: dict | None = None) -> tuple[str, bool]:
+        result = await self.session.call_tool(tool, arguments or {})
+        return extract_text(result), result.isError
@@ -11,22 +11,24 @@ Usage:
 """
 
 import asyncio
-import json
-import os
+import functools
 import random
-import sys
 import uuid
+from collections import defaultdict
 
 import redis.asyncio as aioredis
-from mcp.client.session import ClientSession
-from mcp.client.stdio import StdioServerParameters, stdio_client
 
-# Resolve paths
-PYTHON = sys.executable
-MAIN_PY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+from mcp_player import MCPPlayer
+
+try:
+    import orjson as _json  # optional: faster state decoding
+except ImportError:
+    import json as _json
 
 COLORS = ["Red", "Yellow", "Green", "Blue"]
 
+GAME_TIMEOUT = 60.0  # seconds allowed for the full game in Test 5
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -36,194 +38,202 @@ def log(msg: str) -> None:
     print(msg, flush=True)
 
 
-def extract_text(result) -> str:
-    """Pull the text string out of a CallToolResult."""
-    return result.content[0].text
+def check(cond: object, msg: str) -> None:
+    """Like ``assert``, but still runs under ``python -O``."""
+    if not cond:
+        raise AssertionError(msg)
+
+
+HAND_HEADER = "=== Your Hand ==="
 
 
 def parse_hand_from_status(status_text: str) -> list[str]:
     """Parse the player's hand from the status output."""
-    cards = []
-    in_hand = False
-    for line in status_text.splitlines():
-        if line.strip() == "=== Your Hand ===":
-            in_hand = True
-            continue
-        if line.strip() == "" and in_hand:
-            break
-        if in_hand:
-            # Lines look like: " 1. Red 3"
-            parts = line.strip().split(". ", 1)
-            if len(parts) == 2:
-                cards.append(parts[1])
-    return cards
+    start = status_text.find(HAND_HEADER)
+    if start < 0:
+        return []
+    # The hand section runs from the header to the first blank line
+    start += len(HAND_HEADER)
+    end = status_text.find("\n\n", start)
+    region = status_text[start:end] if end >= 0 else status_text[start:]
+    # Lines look like: " 1. Red 3"
+    return [
+        line.strip().split(". ", 1)[1]
+        for line in region.splitlines()
+        if ". " in line
+    ]
+
+
+def _parse_field(status_text: str, prefix: str) -> str:
+    """Return the rest of the first line starting with *prefix*, or ""."""
+    if status_text.startswith(prefix):
+        start = len(prefix)
+    else:
+        start = status_text.find("\n" + prefix)
+        if start < 0:
+            return ""
+        start += 1 + len(prefix)
+    end = status_text.find("\n", start)
+    return status_text[start:end] if end >= 0 else status_text[start:]
 
 
 def parse_top_card(status_text: str) -> str:
-    for line in status_text.splitlines():
-        if line.startswith("Top card: "):
-            return line[len("Top card: "):]
-    return ""
+    return _parse_field(status_text, "Top card: ")
 
 
 def parse_current_color(status_text: str) -> str:
-    for line in status_text.splitlines():
-        if line.startswith("Current color: "):
-            return line[len("Current color: "):]
-    return ""
+    return _parse_field(status_text, "Current color: ")
 
 
 def parse_status_line(status_text: str) -> str:
-    for line in status_text.splitlines():
-        if line.startswith("Status: "):
-            return line[len("Status: "):]
-    return ""
+    return _parse_field(status_text, "Status: ")
 
 
 def is_wild(card: str) -> bool:
     return card in ("Wild", "Wild Draw Four")
 
 
-def is_valid_play(card: str, top_card: str, current_color: str) -> bool:
+@functools.lru_cache(maxsize=None)
+def _split_card(card: str) -> tuple[str, str]:
+    """Split "Red Draw Two" into ("Red", "Draw Two"); wilds map to ("Wild", card)."""
     if is_wild(card):
-        return True
-    card_parts = card.split(" ", 1)
-    top_parts = top_card.split(" ", 1)
-    if len(card_parts) < 2 or len(top_parts) < 2:
-        return False
-    card_color = card_parts[0]
-    card_value = card_parts[1]
-    top_value = top_parts[1]
-    if card_color == current_color:
-        return True
-    if card_value == top_value:
-        return True
-    return False
+        return "Wild", card
+    color, _, value = card.partition(" ")
+    return color, value
 
 
 def choose_play(hand: list[str], top_card: str, current_color: str):
-    """Pick a card to play.  Returns (card, chosen_color) or None."""
+    """Pick a card to play.  Returns (card, chosen_color) or None.
+
+    Prefers a color match, then a value match, then a wild.
+    """
+    by_color: defaultdict[str, list[str]] = defaultdict(list)
+    by_value: defaultdict[str, list[str]] = defaultdict(list)
+    wilds: list[str] = []
     for card in hand:
-        if is_valid_play(card, top_card, current_color):
-            chosen_color = random.choice(COLORS) if is_wild(card) else None
-            return card, chosen_color
-    return None
+        color, value = _split_card(card)
+        if color == "Wild":
+            wilds.append(card)
+        else:
+            by_color[color].append(card)
+            by_value[value].append(card)
+    top_value = _split_card(top_card)[1]
+    matches = by_color.get(current_color, []) + by_value.get(top_value, []) + wilds
+    if not matches:
+        return None
+    card = matches[0]
+    chosen_color = random.choice(COLORS) if is_wild(card) else None
+    return card, chosen_color
 
 
 # ---------------------------------------------------------------------------
 # MCP client wrapper
 # ---------------------------------------------------------------------------
 
-class MCPPlayer:
-    """Wraps an MCP client session connected to one player's server process."""
+class MCPHost:
+    """The MCP connections for every player of one game.
 
-    def __init__(self, name: str):
-        self.name = name
-        self._stdio_cm = None
-        self._session_cm = None
-        self.session: ClientSession | None = None
+    Server processes are spawned and torn down concurrently, so the players'
+    interpreter start-ups overlap instead of running one after another.
+    """
 
-    async def start(self, game_id: str, player: str) -> None:
-        params = StdioServerParameters(
-            command=PYTHON,
-            args=[MAIN_PY, f"--game={game_id}", f"--player={player}"],
+    def __init__(self, game_id: str, player_ids: list[str]):
+        self.game_id = game_id
+        self.players = {pid: MCPPlayer(f"Player {pid}") for pid in player_ids}
+
+    async def start(self) -> None:
+        await asyncio.gather(
+            *(p.start(self.game_id, pid) for pid, p in self.players.items())
         )
-        self._stdio_cm = stdio_client(params)
-        read_stream, write_stream = await self._stdio_cm.__aenter__()
-        self._session_cm = ClientSession(read_stream, write_stream)
-        self.session = await self._session_cm.__aenter__()
-        await self.session.initialize()
 
     async def stop(self) -> None:
-        if self._session_cm:
-            await self._session_cm.__aexit__(None, None, None)
-        if self._stdio_cm:
-            await self._stdio_cm.__aexit__(None, None, None)
-
-    async def call(self, tool: str, arguments: dict | None = None) -> str:
-        result = await self.session.call_tool(tool, arguments or {})
-        text = extract_text(result)
-        is_err = getattr(result, "isError", False)
-        return text, is_err
+        await asyncio.gather(
+            *(p.stop() for p in self.players.values()), return_exceptions=True
+        )
 
 
 # ---------------------------------------------------------------------------
 # Test scenarios
 # ---------------------------------------------------------------------------
 
-async def test_uno():
+async def test_uno(r: aioredis.Redis):
     game_id = f"test_{uuid.uuid4().hex[:8]}"
     log(f"=== Starting UNO test game: {game_id} ===\n")
 
     # Clean up any leftover state
-    r = aioredis.Redis(decode_responses=True)
     await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
 
-    player_a = MCPPlayer("Player A")
-    player_b = MCPPlayer("Player B")
+    host = MCPHost(game_id, ["A", "B"])
+    player_a = host.players["A"]
+    player_b = host.players["B"]
 
     try:
         # Start both MCP server processes
-        await player_a.start(game_id, "A")
-        await player_b.start(game_id, "B")
+        await host.start()
         log("Both MCP server processes started.\n")
 
+        # Tests 1 and 2 only read state, so fetch everything up front
+        tools_result, (status_a, _), (status_b, _) = await asyncio.gather(
+            player_a.session.list_tools(),
+            player_a.call("status"),
+            player_b.call("status"),
+        )
+
         # ----- Test 1: list_tools --------------------------------------------
         log("--- Test 1: List tools ---")
-        tools_result = await player_a.session.list_tools()
         tool_names = sorted([t.name for t in tools_result.tools])
         log(f"  Available tools: {tool_names}")
-        assert tool_names == ["draw", "play", "status", "wait"], (
-            f"Expected [draw, play, status, wait], got {tool_names}"
+        check(
+            tool_names == ["draw", "play", "status", "wait"],
+            f"Expected [draw, play, status, wait], got {tool_names}",
         )
         log("  PASS: All 4 tools available.\n")
 
         # ----- Test 2: initial status for both players -----------------------
         log("--- Test 2: Initial status ---")
-        status_a, _ = await player_a.call("status")
-        status_b, _ = await player_b.call("status")
         log(f"  Player A status:\n{_indent(status_a)}\n")
         log(f"  Player B status:\n{_indent(status_b)}\n")
 
         hand_a = parse_hand_from_status(status_a)
         hand_b = parse_hand_from_status(status_b)
-        assert len(hand_a) >= 7, f"Player A should have >= 7 cards, got {len(hand_a)}"
-        assert len(hand_b) == 7, f"Player B should have 7 cards, got {len(hand_b)}"
+        check(len(hand_a) >= 7, f"Player A should have >= 7 cards, got {len(hand_a)}")
+        check(len(hand_b) == 7, f"Player B should have 7 cards, got {len(hand_b)}")
 
         status_line_a = parse_status_line(status_a)
         status_line_b = parse_status_line(status_b)
         # Exactly one should have YOUR TURN
         turns = [status_line_a, status_line_b]
-        assert turns.count("YOUR TURN") == 1, f"Expected exactly 1 YOUR TURN, got {turns}"
-        assert turns.count("OPPONENT'S TURN") == 1, f"Expected exactly 1 OPPONENT'S TURN, got {turns}"
+        check(turns.count("YOUR TURN") == 1, f"Expected exactly 1 YOUR TURN, got {turns}")
+        check(turns.count("OPPONENT'S TURN") == 1, f"Expected exactly 1 OPPONENT'S TURN, got {turns}")
         log("  PASS: Both players see consistent initial state.\n")
 
-        # ----- Test 3: Error – wrong turn ------------------------------------
-        log("--- Test 3: Wrong-turn error ---")
-        # Figure out who does NOT have the turn
+        # Tests 3 and 4 both leave the state untouched, so issue them together
         if status_line_a == "YOUR TURN":
-            wrong_player = player_b
-            wrong_name = "Player B"
+            current, cur_label = player_a, "Player A"
+            wrong_player, wrong_name = player_b, "Player B"
         else:
-            wrong_player = player_a
-            wrong_name = "Player A"
-        text, is_err = await wrong_player.call("draw")
+            current, cur_label = player_b, "Player B"
+            wrong_player, wrong_name = player_a, "Player A"
+        (text3, is_err3), (text4, is_err4) = await asyncio.gather(
+            wrong_player.call("draw"),
+            current.call("play", {"card": "Fake Card 99"}),
+        )
+
+        # ----- Test 3: Error – wrong turn ------------------------------------
+        log("--- Test 3: Wrong-turn error ---")
         log(f"  {wrong_name} tried to draw out of turn:")
-        log(f"    Response: {text}")
-        log(f"    isError: {is_err}")
-        assert is_err, "Expected isError=True for wrong-turn draw"
-        assert "not your turn" in text.lower(), f"Expected 'not your turn' in error: {text}"
+        log(f"    Response: {text3}")
+        log(f"    isError: {is_err3}")
+        check(is_err3, "Expected isError=True for wrong-turn draw")
+        check("not your turn" in text3.lower(), f"Expected 'not your turn' in error: {text3}")
         log("  PASS: Wrong-turn error works.\n")
 
         # ----- Test 4: Error – invalid card ----------------------------------
         log("--- Test 4: Invalid card error ---")
-        current = player_a if status_line_a == "YOUR TURN" else player_b
-        cur_label = "Player A" if current is player_a else "Player B"
-        text, is_err = await current.call("play", {"card": "Fake Card 99"})
         log(f"  {cur_label} tried to play 'Fake Card 99':")
-        log(f"    Response: {text}")
-        log(f"    isError: {is_err}")
-        assert is_err, "Expected isError=True for card-not-in-hand"
+        log(f"    Response: {text4}")
+        log(f"    isError: {is_err4}")
+        check(is_err4, "Expected isError=True for card-not-in-hand")
         log("  PASS: Invalid card error works.\n")
 
         # ----- Test 5: Play a full game --------------------------------------
@@ -231,50 +241,81 @@ async def test_uno():
         players = {"A": player_a, "B": player_b}
         turn_count = 0
         max_turns = 300  # safety limit
-
-        while turn_count < max_turns:
-            turn_count += 1
-
-            # Get status from both to find whose turn it is
-            status_a_text, _ = await player_a.call("status")
-            sl = parse_status_line(status_a_text)
-
-            if sl in ("YOU WON!", "OPPONENT WON!"):
-                log(f"\n  Turn {turn_count}: Game over!")
-                log(f"  Player A sees: {sl}")
-                break
-
-            if sl == "YOUR TURN":
-                cur_id = "A"
-            else:
-                cur_id = "B"
-
-            cur_player = players[cur_id]
-
-            # Get current player's status
-            status_text, _ = await cur_player.call("status")
-            hand = parse_hand_from_status(status_text)
-            top = parse_top_card(status_text)
-            color = parse_current_color(status_text)
-
-            move = choose_play(hand, top, color)
-            if move:
-                card, chosen_color = move
-                args = {"card": card}
-                if chosen_color:
-                    args["chosen_color"] = chosen_color
-                text, is_err = await cur_player.call("play", args)
-                log(f"  Turn {turn_count} [{cur_id}]: PLAY {card}"
-                    + (f" (color={chosen_color})" if chosen_color else "")
-                    + f" → {text}")
-                assert not is_err, f"Unexpected error playing card: {text}"
-            else:
-                text, is_err = await cur_player.call("draw")
-                log(f"  Turn {turn_count} [{cur_id}]: DRAW → {text}")
-                assert not is_err, f"Unexpected error drawing: {text}"
-        else:
-            # If we hit max_turns, game is still valid – just long
-            log(f"\n  Reached {max_turns} turn limit; stopping.\n")
+        game_over = asyncio.Event()
+
+        async def play_loop(cur_id: str, cur_player: MCPPlayer) -> None:
+            """Block on `wait` until it is this player's turn, then move."""
+            nonlocal turn_count
+            while not game_over.is_set():
+                await cur_player.call("wait")
+                if game_over.is_set():
+                    break
+
+                status_text, _ = await cur_player.call("status")
+                sl = parse_status_line(status_text)
+
+                if sl in ("YOU WON!", "OPPONENT WON!"):
+                    log(f"\n  Turn {turn_count}: Game over!")
+                    log(f"  Player {cur_id} sees: {sl}")
+                    game_over.set()
+                    break
+                if sl != "YOUR TURN":
+                    # wait timed out while the opponent was still moving
+                    continue
+                if turn_count >= max_turns:
+                    # If we hit max_turns, game is still valid – just long
+                    log(f"\n  Reached {max_turns} turn limit; stopping.\n")
+                    game_over.set()
+                    break
+                turn_count += 1
+
+                hand = parse_hand_from_status(status_text)
+                top = parse_top_card(status_text)
+                color = parse_current_color(status_text)
+
+                move = choose_play(hand, top, color)
+                if move:
+                    card, chosen_color = move
+                    args = {"card": card}
+                    if chosen_color:
+                        args["chosen_color"] = chosen_color
+                    text, is_err = await cur_player.call("play", args)
+                    log(f"  Turn {turn_count} [{cur_id}]: PLAY {card}"
+                        + (f" (color={chosen_color})" if chosen_color else "")
+                        + f" → {text}")
+                    check(not is_err, f"Unexpected error playing card: {text}")
+                else:
+                    text, is_err = await cur_player.call("draw")
+                    log(f"  Turn {turn_count} [{cur_id}]: DRAW → {text}")
+                    check(not is_err, f"Unexpected error drawing: {text}")
+
+                if "You win" in text:
+                    log(f"\n  Turn {turn_count}: Game over!")
+                    log(f"  Player {cur_id} wins!")
+                    game_over.set()
+                    break
+
+        async def play_game() -> None:
+            # One loop per player; whichever finishes first (game over, turn
+            # limit or a failed assertion) cancels the other, which may still
+            # be blocked in `wait`.
+            loops = [
+                asyncio.create_task(play_loop(pid, p)) for pid, p in players.items()
+            ]
+            try:
+                done, _ = await asyncio.wait(loops, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                game_over.set()
+                for task in loops:
+                    task.cancel()
+                await asyncio.gather(*loops, return_exceptions=True)
+            for task in done:
+                task.result()
+
+        try:
+            await asyncio.wait_for(play_game(), timeout=GAME_TIMEOUT)
+        except asyncio.TimeoutError:
+            log(f"\n  Game still running after {GAME_TIMEOUT:.0f}s; aborting.\n")
 
         # ----- Final state ---------------------------------------------------
         log("\n--- Final game state ---")
@@ -286,12 +327,12 @@ async def test_uno():
         # ----- Validate end state against Redis ------------------------------
         log("--- Validating end state ---")
         raw = await r.get(f"uno:{game_id}")
-        state = json.loads(raw)
+        state = _json.loads(raw)
 
         final_hand_a = parse_hand_from_status(final_a)
         final_hand_b = parse_hand_from_status(final_b)
-        assert final_hand_a == state["hands"]["A"], "Player A hand mismatch with Redis"
-        assert final_hand_b == state["hands"]["B"], "Player B hand mismatch with Redis"
+        check(final_hand_a == state["hands"]["A"], "Player A hand mismatch with Redis")
+        check(final_hand_b == state["hands"]["B"], "Player B hand mismatch with Redis")
         log("  PASS: Player hands match Redis state.")
 
         total_cards = (
@@ -300,7 +341,7 @@ async def test_uno():
             + len(state["draw_pile"])
             + len(state["discard_pile"])
         )
-        assert total_cards == 108, f"Card conservation violated: {total_cards} != 108"
+        check(total_cards == 108, f"Card conservation violated: {total_cards} != 108")
         log(f"  PASS: Card conservation OK ({total_cards} cards total).")
 
         sl_a = parse_status_line(final_a)
@@ -309,13 +350,13 @@ async def test_uno():
             winner = state["winner"]
             log(f"  Winner: Player {winner}")
             if winner == "A":
-                assert sl_a == "YOU WON!", f"Player A should see YOU WON!, got {sl_a}"
-                assert sl_b == "OPPONENT WON!", f"Player B should see OPPONENT WON!, got {sl_b}"
-                assert len(state["hands"]["A"]) == 0, "Winner should have 0 cards"
+                check(sl_a == "YOU WON!", f"Player A should see YOU WON!, got {sl_a}")
+                check(sl_b == "OPPONENT WON!", f"Player B should see OPPONENT WON!, got {sl_b}")
+                check(len(state["hands"]["A"]) == 0, "Winner should have 0 cards")
             else:
-                assert sl_b == "YOU WON!", f"Player B should see YOU WON!, got {sl_b}"
-                assert sl_a == "OPPONENT WON!", f"Player A should see OPPONENT WON!, got {sl_a}"
-                assert len(state["hands"]["B"]) == 0, "Winner should have 0 cards"
+                check(sl_b == "YOU WON!", f"Player B should see YOU WON!, got {sl_b}")
+                check(sl_a == "OPPONENT WON!", f"Player A should see OPPONENT WON!, got {sl_a}")
+                check(len(state["hands"]["B"]) == 0, "Winner should have 0 cards")
             log("  PASS: Winner state is consistent.")
         else:
             log("  Game did not finish within turn limit (still valid).")
@@ -324,11 +365,9 @@ async def test_uno():
         log("\n=== ALL TESTS PASSED ===")
 
     finally:
-        await player_b.stop()
-        await player_a.stop()
+        await host.stop()
         # Clean up Redis
         await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
-        await r.close()
 
 
 def _indent(text: str, prefix: str = "    ") -> str:
@@ -336,7 +375,9 @@ def _indent(text: str, prefix: str = "    ") -> str:
 
 
 async def main():
-    await test_uno()
+    # Opened on the running loop: redis.asyncio connections are bound to it
+    async with aioredis.Redis(decode_responses=True, max_connections=16) as r:
+        await test_uno(r)
 
 
 if __name__ == "__main__":
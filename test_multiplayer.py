@@ -11,30 +11,64 @@ Usage:
 """
 
 import asyncio
-import json
+import contextvars
+import functools
 import os
 import random
+import re
 import sys
 import uuid
 
 import aiohttp
 import redis.asyncio as aioredis
-from mcp.client.session import ClientSession
-from mcp.client.stdio import StdioServerParameters, stdio_client
 
-PYTHON = sys.executable
-MAIN_PY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+import mcp_player
+
+try:
+    import orjson as _json  # optional: faster state encode/decode
+except ImportError:
+    import json as _json
 
 COLORS = ["Red", "Yellow", "Green", "Blue"]
-PORT_MAP = {"A": 19000, "B": 19001, "C": 19002, "D": 19003}
+WILD_CARDS = frozenset({"Wild", "Wild Draw Four"})
+# Set UNO_TEST_SEED to replay the same wild-colour picks
+_SEED = os.environ.get("UNO_TEST_SEED")
+# The full 3p and 4p games run concurrently, so each gets its own web
+# ports (the targeted tests use the server defaults, 19000 and up)
+GAME_PORT_MAPS = {
+    3: {"A": 19100, "B": 19101, "C": 19102},
+    4: {"A": 19200, "B": 19201, "C": 19202, "D": 19203},
+}
+
+_STATUS_RE = re.compile(r"^(Top card|Current color|Status|Direction): (.*)$", re.M)
+
+
+_LOG_BUF: list[str] = []
+_LOG_FLUSH_LINES = 64
+# Set while a full game runs: its lines are held back and written as one
+# block when the game ends, so the concurrent 3p/4p output doesn't interleave
+_GAME_LOG: contextvars.ContextVar[list[str] | None] = contextvars.ContextVar(
+    "_GAME_LOG", default=None
+)
 
 
 def log(msg: str) -> None:
-    print(msg, flush=True)
+    # Buffered: a full game logs hundreds of lines, so flush in batches
+    # rather than once per line. Call flush_logs() at test boundaries.
+    game_log = _GAME_LOG.get()
+    if game_log is not None:
+        game_log.append(msg)
+        return
+    _LOG_BUF.append(msg)
+    if len(_LOG_BUF) >= _LOG_FLUSH_LINES:
+        flush_logs()
 
 
-def extract_text(result) -> str:
-    return result.content[0].text
+def flush_logs() -> None:
+    if _LOG_BUF:
+        sys.stdout.write("\n".join(_LOG_BUF) + "\n")
+        sys.stdout.flush()
+        _LOG_BUF.clear()
 
 
 def parse_hand_from_status(status_text: str) -> list[str]:
@@ -53,30 +87,22 @@ def parse_hand_from_status(status_text: str) -> list[str]:
     return cards
 
 
-def parse_top_card(status_text: str) -> str:
-    for line in status_text.splitlines():
-        if line.startswith("Top card: "):
-            return line[len("Top card: "):]
-    return ""
-
-
-def parse_current_color(status_text: str) -> str:
-    for line in status_text.splitlines():
-        if line.startswith("Current color: "):
-            return line[len("Current color: "):]
-    return ""
+def parse_status_fields(status_text: str) -> dict[str, str]:
+    """Map each "Key: value" table line (top card, colour, status,
+    direction) to its value in one regex pass."""
+    return dict(_STATUS_RE.findall(status_text))
 
 
 def parse_status_line(status_text: str) -> str:
-    for line in status_text.splitlines():
-        if line.startswith("Status: "):
-            return line[len("Status: "):]
-    return ""
+    return parse_status_fields(status_text).get("Status", "")
 
 
 def parse_whose_turn(status_text: str) -> str | None:
     """Return the player ID whose turn it is, or None if game over."""
-    sl = parse_status_line(status_text)
+    return _whose_turn(parse_status_line(status_text))
+
+
+def _whose_turn(sl: str) -> str | None:
     if "WON" in sl:
         return None
     if sl == "YOUR TURN":
@@ -87,91 +113,123 @@ def parse_whose_turn(status_text: str) -> str | None:
     return None
 
 
-def is_wild(card: str) -> bool:
-    return card in ("Wild", "Wild Draw Four")
+class StatusView:
+    """Lazily parsed view of one status text: each field is parsed on first
+    access and cached, so the play loop only pays for what it reads."""
+
+    def __init__(self, raw: str):
+        self.raw = raw
+
+    @functools.cached_property
+    def fields(self) -> dict[str, str]:
+        return parse_status_fields(self.raw)
+
+    @functools.cached_property
+    def hand(self) -> list[str]:
+        return parse_hand_from_status(self.raw)
+
+    @property
+    def top(self) -> str:
+        return self.fields.get("Top card", "")
+
+    @property
+    def color(self) -> str:
+        return self.fields.get("Current color", "")
+
+    @property
+    def status_line(self) -> str:
+        return self.fields.get("Status", "")
 
+    @property
+    def direction(self) -> int:
+        return -1 if self.fields.get("Direction") == "Counter-clockwise" else 1
 
-def is_valid_play(card: str, top_card: str, current_color: str) -> bool:
-    if is_wild(card):
-        return True
-    card_parts = card.split(" ", 1)
-    top_parts = top_card.split(" ", 1)
-    if len(card_parts) < 2 or len(top_parts) < 2:
-        return False
-    if card_parts[0] == current_color:
-        return True
-    if card_parts[1] == top_parts[1]:
-        return True
-    return False
+    @functools.cached_property
+    def whose_turn(self) -> str | None:
+        return _whose_turn(self.status_line)
 
 
-def choose_play(hand: list[str], top_card: str, current_color: str):
+def predict_next_player(player_ids: list[str], cur_id: str, direction: int,
+                        card: str | None) -> str:
+    """Mirror the server's turn rules: who moves after `cur_id` plays `card`
+    (None for a draw)."""
+    step = 1
+    if card == "Wild Draw Four" or (card and card.endswith((" Skip", " Draw Two"))):
+        step = 2
+    elif card and card.endswith(" Reverse"):
+        direction = -direction
+    idx = player_ids.index(cur_id)
+    return player_ids[(idx + direction * step) % len(player_ids)]
+
+
+@functools.lru_cache(maxsize=None)
+def _split_card(card: str) -> tuple[str, str]:
+    """Split "Red Draw Two" into ("Red", "Draw Two")."""
+    color, _, value = card.partition(" ")
+    return color, value
+
+
+def game_rng(num_players: int) -> random.Random:
+    """Per-game RNG, so concurrent games don't interleave draws on one stream."""
+    if _SEED is None:
+        return random.Random()
+    return random.Random(f"{_SEED}:{num_players}")
+
+
+def choose_play(hand: list[str], top_card: str, current_color: str,
+                rng: random.Random):
+    top_value = _split_card(top_card)[1]
     for card in hand:
-        if is_valid_play(card, top_card, current_color):
-            chosen_color = random.choice(COLORS) if is_wild(card) else None
-            return card, chosen_color
+        if card in WILD_CARDS:
+            return card, rng.choice(COLORS)
+        color, value = _split_card(card)
+        if color == current_color or value == top_value:
+            return card, None
     return None
 
 
-class MCPPlayer:
-    def __init__(self, name: str):
-        self.name = name
-        self._stdio_cm = None
-        self._session_cm = None
-        self.session: ClientSession | None = None
+class MCPPlayer(mcp_player.MCPPlayer):
+    async def start(self, game_id: str, player: str, num_players: int,
+                    port: int | None = None) -> None:
+        flags = [f"--num-players={num_players}"]
+        if port is not None:
+            flags.append(f"--port={port}")
+        await super().start(game_id, player, *flags)
 
-    async def start(self, game_id: str, player: str, num_players: int) -> None:
-        params = StdioServerParameters(
-            command=PYTHON,
-            args=[MAIN_PY, f"--game={game_id}", f"--player={player}",
-                  f"--num-players={num_players}"],
-        )
-        self._stdio_cm = stdio_client(params)
-        read_stream, write_stream = await self._stdio_cm.__aenter__()
-        self._session_cm = ClientSession(read_stream, write_stream)
-        self.session = await self._session_cm.__aenter__()
-        await self.session.initialize()
 
-    async def stop(self) -> None:
-        if self._session_cm:
-            await self._session_cm.__aexit__(None, None, None)
-        if self._stdio_cm:
-            await self._stdio_cm.__aexit__(None, None, None)
+async def load_state(r: aioredis.Redis, game_id: str) -> dict:
+    """Fetch and decode the game's full state once; callers read every
+    field they assert on from the returned dict."""
+    return _json.loads(await r.get(f"uno:{game_id}"))
 
-    async def call(self, tool: str, arguments: dict | None = None) -> tuple[str, bool]:
-        result = await self.session.call_tool(tool, arguments or {})
-        text = extract_text(result)
-        is_err = getattr(result, "isError", False)
-        return text, is_err
+
+async def seed_state(r: aioredis.Redis, game_id: str, state: dict) -> None:
+    """Replace the game's state (and drop any stale lock) in one round trip."""
+    async with r.pipeline(transaction=False) as pipe:
+        pipe.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
+        pipe.set(f"uno:{game_id}", _json.dumps(state))
+        await pipe.execute()
 
 
 def _indent(text: str, prefix: str = "    ") -> str:
     return "\n".join(prefix + line for line in text.splitlines())
 
 
-async def find_current_player(players: dict[str, MCPPlayer]) -> str | None:
-    """Query Player A's status to determine whose turn it is. Return player ID or None."""
-    status_text, _ = await players["A"].call("status")
-    sl = parse_status_line(status_text)
-    if "WON" in sl:
-        return None
-    if sl == "YOUR TURN":
-        return "A"
-    # "Player X's TURN"
-    if sl.startswith("Player ") and sl.endswith("'s TURN"):
-        return sl[len("Player "):-len("'s TURN")]
-    return None
-
-
-async def test_game(num_players: int) -> None:
+async def test_game(num_players: int, r: aioredis.Redis,
+                    http_session: aiohttp.ClientSession) -> None:
     """Run a full automated game with the given number of players."""
     player_ids = ["A", "B", "C", "D"][:num_players]
+    port_map = GAME_PORT_MAPS[num_players]
+    # Everyone but pid, computed once for the wrong-turn and winner checks
+    others = {pid: [p for p in player_ids if p != pid] for pid in player_ids}
     game_id = f"mp{num_players}_{uuid.uuid4().hex[:8]}"
+    rng = game_rng(num_players)
+    game_log: list[str] = []
+    log_token = _GAME_LOG.set(game_log)
     log(f"\n{'='*60}")
     log(f"=== {num_players}-Player Game: {game_id} ===")
     log(f"{'='*60}\n")
 
-    r = aioredis.Redis(decode_responses=True)
     await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
 
     players: dict[str, MCPPlayer] = {}
@@ -180,8 +238,10 @@ async def test_game(num_players: int) -> None:
 
     try:
         # Start all MCP server processes
-        for pid in player_ids:
-            await players[pid].start(game_id, pid, num_players)
+        await asyncio.gather(
+            *(players[pid].start(game_id, pid, num_players, port_map[pid])
+              for pid in player_ids)
+        )
         log(f"All {num_players} MCP server processes started.\n")
 
         # ----- Test: list_tools -----------------------------------------------
@@ -195,23 +255,28 @@ async def test_game(num_players: int) -> None:
 
         # ----- Test: initial status -------------------------------------------
         log("--- Test: Initial status ---")
+        # Hand sizes come straight from Redis; one status call on A covers
+        # the rendered view (and is reused for the wrong-turn test below).
+        state, (status_a, _) = await asyncio.gather(
+            load_state(r, game_id), players["A"].call("status")
+        )
         for pid in player_ids:
-            status_text, _ = await players[pid].call("status")
-            hand = parse_hand_from_status(status_text)
-            log(f"  Player {pid}: {len(hand)} cards, status: {parse_status_line(status_text)}")
+            hand_size = len(state["hands"][pid])
+            log(f"  Player {pid}: {hand_size} cards"
+                + (" (to play)" if state["current_turn"] == pid else ""))
             # Each player should have >= 7 cards (Player A may have 9 if Draw Two start)
-            assert len(hand) >= 7, f"Player {pid} should have >= 7 cards, got {len(hand)}"
+            assert hand_size >= 7, f"Player {pid} should have >= 7 cards, got {hand_size}"
+        assert len(parse_hand_from_status(status_a)) == len(state["hands"]["A"]), (
+            "Player A's status hand doesn't match Redis"
+        )
 
         # Verify direction is shown for 3+ player games
-        status_a, _ = await players["A"].call("status")
         if num_players > 2:
             assert "Direction:" in status_a, "Expected Direction line for 3+ player game"
         log("  PASS: Initial status OK.\n")
 
         # ----- Test: state has player_order and direction ---------------------
         log("--- Test: Redis state structure ---")
-        raw = await r.get(f"uno:{game_id}")
-        state = json.loads(raw)
         assert "player_order" in state, "Missing player_order in state"
         assert "direction" in state, "Missing direction in state"
         assert state["player_order"] == player_ids, (
@@ -223,28 +288,34 @@ async def test_game(num_players: int) -> None:
 
         # ----- Test: web server responds on correct ports ---------------------
         log("--- Test: Web server ---")
-        async with aiohttp.ClientSession() as http_session:
-            for pid in player_ids:
-                port = PORT_MAP[pid]
-                url = f"http://localhost:{port}/"
-                try:
-                    async with http_session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as resp:
-                        assert resp.status == 200, f"Web server for Player {pid} returned {resp.status}"
-                        body = await resp.text()
-                        assert f"Player {pid}" in body, (
-                            f"Web page for Player {pid} doesn't contain player name"
-                        )
-                        log(f"  Player {pid} web server at :{port} OK")
-                except Exception as e:
-                    log(f"  WARNING: Player {pid} web server at :{port} failed: {e}")
+        async def probe(pid: str) -> tuple[str, int, str]:
+            url = f"http://localhost:{port_map[pid]}/"
+            async with http_session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as resp:
+                return pid, resp.status, await resp.text()
+
+        results = await asyncio.gather(*map(probe, player_ids), return_exceptions=True)
+        for pid, result in zip(player_ids, results):
+            port = port_map[pid]
+            try:
+                if isinstance(result, BaseException):
+                    raise result
+                _, status, body = result
+                assert status == 200, f"Web server for Player {pid} returned {status}"
+                assert f"Player {pid}" in body, (
+                    f"Web page for Player {pid} doesn't contain player name"
+                )
+                log(f"  Player {pid} web server at :{port} OK")
+            except Exception as e:
+                log(f"  WARNING: Player {pid} web server at :{port} failed: {e}")
         log("  PASS: Web servers respond.\n")
 
         # ----- Test: wrong-turn error -----------------------------------------
         log("--- Test: Wrong-turn error ---")
-        cur_id = await find_current_player(players)
-        assert cur_id is not None, "Game should not be over yet"
+        whose = parse_whose_turn(status_a)
+        assert whose is not None, "Game should not be over yet"
+        cur_id = "A" if whose == "self" else whose
         # Pick a player who does NOT have the turn
-        wrong_id = [p for p in player_ids if p != cur_id][0]
+        wrong_id = others[cur_id][0]
         text, is_err = await players[wrong_id].call("draw")
         assert is_err, "Expected isError=True for wrong-turn draw"
         assert "not your turn" in text.lower(), f"Expected 'not your turn' in error: {text}"
@@ -259,29 +330,31 @@ async def test_game(num_players: int) -> None:
         while turn_count < max_turns:
             turn_count += 1
 
-            cur_id = await find_current_player(players)
-            if cur_id is None:
+            # Ask the predicted player directly: one status call per turn.
+            status_text, _ = await players[cur_id].call("status")
+            view = StatusView(status_text)
+            while view.whose_turn not in ("self", None):
+                # Prediction missed; follow the server's answer
+                cur_id = view.whose_turn
+                status_text, _ = await players[cur_id].call("status")
+                view = StatusView(status_text)
+            if view.whose_turn is None:
                 log(f"\n  Turn {turn_count}: Game over!")
                 break
 
             cur_player = players[cur_id]
-            status_text, _ = await cur_player.call("status")
-            hand = parse_hand_from_status(status_text)
-            top = parse_top_card(status_text)
-            color = parse_current_color(status_text)
-
-            move = choose_play(hand, top, color)
+            move = choose_play(view.hand, view.top, view.color, rng)
             if move:
                 card, chosen_color = move
                 args = {"card": card}
                 if chosen_color:
                     args["chosen_color"] = chosen_color
                 text, is_err = await cur_player.call("play", args)
-                log(f"  Turn {turn_count} [{cur_id}]: PLAY {card}"
-                    + (f" (color={chosen_color})" if chosen_color else "")
-                    + f" -> {text}")
+                color_note = f" (color={chosen_color})" if chosen_color else ""
+                log(f"  Turn {turn_count} [{cur_id}]: PLAY {card}{color_note} -> {text}")
                 assert not is_err, f"Unexpected error playing card: {text}"
             else:
+                card = None
                 text, is_err = await cur_player.call("draw")
                 log(f"  Turn {turn_count} [{cur_id}]: DRAW -> {text}")
                 assert not is_err, f"Unexpected error drawing: {text}"
@@ -289,23 +362,24 @@ async def test_game(num_players: int) -> None:
             if "You win" in text:
                 log(f"  Player {cur_id} wins!")
                 break
+
+            cur_id = predict_next_player(player_ids, cur_id, view.direction, card)
         else:
             log(f"\n  Reached {max_turns} turn limit; stopping.\n")
 
         # ----- Final state ----------------------------------------------------
         log("\n--- Final game state ---")
-        for pid in player_ids:
-            final_text, _ = await players[pid].call("status")
+        final_results = await asyncio.gather(*(players[pid].call("status") for pid in player_ids))
+        final_texts = {pid: text for pid, (text, _) in zip(player_ids, final_results)}
+        for pid, final_text in final_texts.items():
             log(f"  Player {pid}:\n{_indent(final_text)}\n")
 
         # ----- Validate end state against Redis -------------------------------
         log("--- Validating end state ---")
-        raw = await r.get(f"uno:{game_id}")
-        state = json.loads(raw)
+        state = await load_state(r, game_id)
 
         # Verify hands match Redis
-        for pid in player_ids:
-            final_text, _ = await players[pid].call("status")
+        for pid, final_text in final_texts.items():
             hand_from_status = parse_hand_from_status(final_text)
             assert hand_from_status == state["hands"][pid], (
                 f"Player {pid} hand mismatch with Redis"
@@ -324,18 +398,17 @@ async def test_game(num_players: int) -> None:
             log(f"  Winner: Player {winner}")
             assert len(state["hands"][winner]) == 0, "Winner should have 0 cards"
 
+            # Once a winner is set the game is frozen, so the final statuses
+            # fetched above are still current.
             # Winner should see YOU WON
-            winner_status, _ = await players[winner].call("status")
-            assert "YOU WON" in parse_status_line(winner_status), (
+            assert "YOU WON" in parse_status_line(final_texts[winner]), (
                 f"Winner ({winner}) should see YOU WON"
             )
 
             # All others should see "Player X WON!"
-            for pid in player_ids:
-                if pid != winner:
-                    other_status, _ = await players[pid].call("status")
-                    sl = parse_status_line(other_status)
-                    assert "WON" in sl, f"Player {pid} should see WON status, got: {sl}"
+            for pid in others[winner]:
+                sl = parse_status_line(final_texts[pid])
+                assert "WON" in sl, f"Player {pid} should see WON status, got: {sl}"
             log("  PASS: Winner state is consistent.")
         else:
             log("  Game did not finish within turn limit (still valid).")
@@ -344,22 +417,24 @@ async def test_game(num_players: int) -> None:
         log(f"\n=== {num_players}-PLAYER TEST PASSED ===\n")
 
     finally:
-        for pid in reversed(player_ids):
-            await players[pid].stop()
+        await asyncio.gather(*(players[pid].stop() for pid in player_ids),
+                             return_exceptions=True)
         await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
-        await r.close()
+        _GAME_LOG.reset(log_token)
+        for line in game_log:
+            log(line)
+        flush_logs()
+
 
+TARGETED_PLAYER_IDS = ["A", "B", "C"]
 
-async def test_reverse_direction():
+
+async def test_reverse_direction(r: aioredis.Redis, players: dict[str, MCPPlayer], game_id: str):
     """Test that Reverse changes direction in a 3-player game."""
-    game_id = f"rev_{uuid.uuid4().hex[:8]}"
     log(f"\n{'='*60}")
     log(f"=== Reverse Direction Test: {game_id} ===")
     log(f"{'='*60}\n")
 
-    r = aioredis.Redis(decode_responses=True)
-    await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
-
     # Set up a controlled game state where Player A has a Reverse card
     deck = [f"Red {i}" for i in range(10)] * 10  # filler
     state = {
@@ -377,62 +452,42 @@ async def test_reverse_direction():
         "player_order": ["A", "B", "C"],
         "direction": 1,
     }
-    await r.set(f"uno:{game_id}", json.dumps(state))
+    await seed_state(r, game_id, state)
 
-    players = {}
-    for pid in ["A", "B", "C"]:
-        players[pid] = MCPPlayer(f"Player {pid}")
+    # Verify initial direction is Clockwise (A -> B -> C)
+    status_a, _ = await players["A"].call("status")
+    assert "Clockwise" in status_a, "Initial direction should be Clockwise"
+    log("  Initial direction: Clockwise")
 
-    try:
-        for pid in ["A", "B", "C"]:
-            await players[pid].start(game_id, pid, 3)
-        log("All 3 players started.\n")
-
-        # Verify initial direction is Clockwise (A -> B -> C)
-        status_a, _ = await players["A"].call("status")
-        assert "Clockwise" in status_a, "Initial direction should be Clockwise"
-        log("  Initial direction: Clockwise")
-
-        # Player A plays Red Reverse
-        text, is_err = await players["A"].call("play", {"card": "Red Reverse"})
-        assert not is_err, f"Error playing Reverse: {text}"
-        log(f"  Player A plays Red Reverse: {text}")
-
-        # After Reverse in 3-player: direction flips to Counter-clockwise
-        # Next player should be C (A's previous player in new direction)
-        raw = await r.get(f"uno:{game_id}")
-        state = json.loads(raw)
-        assert state["direction"] == -1, f"Direction should be -1 after Reverse, got {state['direction']}"
-        assert state["current_turn"] == "C", (
-            f"After A plays Reverse (3p), next should be C, got {state['current_turn']}"
-        )
-        log(f"  Direction is now: {state['direction']} (Counter-clockwise)")
-        log(f"  Current turn: {state['current_turn']}")
+    # Player A plays Red Reverse
+    text, is_err = await players["A"].call("play", {"card": "Red Reverse"})
+    assert not is_err, f"Error playing Reverse: {text}"
+    log(f"  Player A plays Red Reverse: {text}")
 
-        # Verify status shows Counter-clockwise
-        status_c, _ = await players["C"].call("status")
-        assert "Counter-clockwise" in status_c, "Direction should be Counter-clockwise"
-        log("  Status confirms Counter-clockwise direction.")
+    # After Reverse in 3-player: direction flips to Counter-clockwise
+    # Next player should be C (A's previous player in new direction)
+    state = await load_state(r, game_id)
+    assert state["direction"] == -1, f"Direction should be -1 after Reverse, got {state['direction']}"
+    assert state["current_turn"] == "C", (
+        f"After A plays Reverse (3p), next should be C, got {state['current_turn']}"
+    )
+    log(f"  Direction is now: {state['direction']} (Counter-clockwise)")
+    log(f"  Current turn: {state['current_turn']}")
 
-        log("\n=== REVERSE DIRECTION TEST PASSED ===\n")
+    # Verify status shows Counter-clockwise
+    status_c, _ = await players["C"].call("status")
+    assert "Counter-clockwise" in status_c, "Direction should be Counter-clockwise"
+    log("  Status confirms Counter-clockwise direction.")
 
-    finally:
-        for pid in reversed(["A", "B", "C"]):
-            await players[pid].stop()
-        await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
-        await r.close()
+    log("\n=== REVERSE DIRECTION TEST PASSED ===\n")
 
 
-async def test_skip_multiplayer():
+async def test_skip_multiplayer(r: aioredis.Redis, players: dict[str, MCPPlayer], game_id: str):
     """Test that Skip skips the next player in a 3-player game."""
-    game_id = f"skip_{uuid.uuid4().hex[:8]}"
     log(f"\n{'='*60}")
     log(f"=== Skip Test (3-player): {game_id} ===")
     log(f"{'='*60}\n")
 
-    r = aioredis.Redis(decode_responses=True)
-    await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
-
     deck = [f"Red {i}" for i in range(10)] * 10
     state = {
         "draw_pile": deck[:80],
@@ -449,48 +504,28 @@ async def test_skip_multiplayer():
         "player_order": ["A", "B", "C"],
         "direction": 1,
     }
-    await r.set(f"uno:{game_id}", json.dumps(state))
+    await seed_state(r, game_id, state)
 
-    players = {}
-    for pid in ["A", "B", "C"]:
-        players[pid] = MCPPlayer(f"Player {pid}")
+    # Player A plays Red Skip — should skip B, go to C
+    text, is_err = await players["A"].call("play", {"card": "Red Skip"})
+    assert not is_err, f"Error playing Skip: {text}"
+    log(f"  Player A plays Red Skip: {text}")
 
-    try:
-        for pid in ["A", "B", "C"]:
-            await players[pid].start(game_id, pid, 3)
-        log("All 3 players started.\n")
-
-        # Player A plays Red Skip — should skip B, go to C
-        text, is_err = await players["A"].call("play", {"card": "Red Skip"})
-        assert not is_err, f"Error playing Skip: {text}"
-        log(f"  Player A plays Red Skip: {text}")
-
-        raw = await r.get(f"uno:{game_id}")
-        state = json.loads(raw)
-        assert state["current_turn"] == "C", (
-            f"After A plays Skip (3p), next should be C (B skipped), got {state['current_turn']}"
-        )
-        log(f"  Current turn: {state['current_turn']} (B was skipped)")
+    state = await load_state(r, game_id)
+    assert state["current_turn"] == "C", (
+        f"After A plays Skip (3p), next should be C (B skipped), got {state['current_turn']}"
+    )
+    log(f"  Current turn: {state['current_turn']} (B was skipped)")
 
-        log("\n=== SKIP TEST PASSED ===\n")
+    log("\n=== SKIP TEST PASSED ===\n")
 
-    finally:
-        for pid in reversed(["A", "B", "C"]):
-            await players[pid].stop()
-        await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
-        await r.close()
 
-
-async def test_draw_two_multiplayer():
+async def test_draw_two_multiplayer(r: aioredis.Redis, players: dict[str, MCPPlayer], game_id: str):
     """Test Draw Two in 3-player: victim draws 2 and is skipped."""
-    game_id = f"d2_{uuid.uuid4().hex[:8]}"
     log(f"\n{'='*60}")
     log(f"=== Draw Two Test (3-player): {game_id} ===")
     log(f"{'='*60}\n")
 
-    r = aioredis.Redis(decode_responses=True)
-    await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
-
     deck = [f"Red {i}" for i in range(10)] * 10
     state = {
         "draw_pile": deck[:80],
@@ -507,55 +542,72 @@ async def test_draw_two_multiplayer():
         "player_order": ["A", "B", "C"],
         "direction": 1,
     }
-    await r.set(f"uno:{game_id}", json.dumps(state))
-
-    players = {}
-    for pid in ["A", "B", "C"]:
-        players[pid] = MCPPlayer(f"Player {pid}")
-
+    await seed_state(r, game_id, state)
+
+    # Player A plays Draw Two — B draws 2 and is skipped, C goes
+    text, is_err = await players["A"].call("play", {"card": "Red Draw Two"})
+    assert not is_err, f"Error playing Draw Two: {text}"
+    log(f"  Player A plays Red Draw Two: {text}")
+
+    state = await load_state(r, game_id)
+    assert state["current_turn"] == "C", (
+        f"After A plays Draw Two (3p), turn should go to C, got {state['current_turn']}"
+    )
+    assert len(state["hands"]["B"]) == 9, (
+        f"Player B should have 9 cards (7+2), got {len(state['hands']['B'])}"
+    )
+    log(f"  Player B now has {len(state['hands']['B'])} cards (drew 2)")
+    log(f"  Current turn: {state['current_turn']} (B was skipped)")
+
+    log("\n=== DRAW TWO TEST PASSED ===\n")
+
+
+async def run_targeted_tests(r: aioredis.Redis) -> None:
+    """Run the targeted 3-player tests against one set of server processes.
+
+    The server re-reads the game from Redis on every tool call, so each test
+    just seeds its own state under the shared game id instead of spawning
+    (and initializing) three fresh processes.
+    """
+    game_id = f"targeted_{uuid.uuid4().hex[:8]}"
+    players = {pid: MCPPlayer(f"Player {pid}") for pid in TARGETED_PLAYER_IDS}
     try:
-        for pid in ["A", "B", "C"]:
-            await players[pid].start(game_id, pid, 3)
-        log("All 3 players started.\n")
-
-        # Player A plays Draw Two — B draws 2 and is skipped, C goes
-        text, is_err = await players["A"].call("play", {"card": "Red Draw Two"})
-        assert not is_err, f"Error playing Draw Two: {text}"
-        log(f"  Player A plays Red Draw Two: {text}")
-
-        raw = await r.get(f"uno:{game_id}")
-        state = json.loads(raw)
-        assert state["current_turn"] == "C", (
-            f"After A plays Draw Two (3p), turn should go to C, got {state['current_turn']}"
+        await asyncio.gather(
+            *(players[pid].start(game_id, pid, 3) for pid in TARGETED_PLAYER_IDS)
         )
-        assert len(state["hands"]["B"]) == 9, (
-            f"Player B should have 9 cards (7+2), got {len(state['hands']['B'])}"
-        )
-        log(f"  Player B now has {len(state['hands']['B'])} cards (drew 2)")
-        log(f"  Current turn: {state['current_turn']} (B was skipped)")
-
-        log("\n=== DRAW TWO TEST PASSED ===\n")
+        log("All 3 targeted-test players started.")
 
+        await test_reverse_direction(r, players, game_id)
+        await test_skip_multiplayer(r, players, game_id)
+        await test_draw_two_multiplayer(r, players, game_id)
     finally:
-        for pid in reversed(["A", "B", "C"]):
-            await players[pid].stop()
+        await asyncio.gather(*(players[pid].stop() for pid in TARGETED_PLAYER_IDS),
+                             return_exceptions=True)
         await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
-        await r.close()
+        flush_logs()
 
 
 async def main():
-    # Run targeted tests first
-    await test_reverse_direction()
-    await test_skip_multiplayer()
-    await test_draw_two_multiplayer()
-
-    # Run full games
-    await test_game(3)
-    await test_game(4)
-
-    log("\n" + "=" * 60)
-    log("=== ALL MULTI-PLAYER TESTS PASSED ===")
-    log("=" * 60)
+    try:
+        async with (
+            aioredis.Redis(decode_responses=True) as r,
+            aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=16)) as http_session,
+        ):
+            # Run targeted tests first
+            await run_targeted_tests(r)
+
+            # Run full games; they use distinct game ids and ports. The task
+            # group cancels the other game if one fails, before r and
+            # http_session are closed.
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(test_game(3, r, http_session))
+                tg.create_task(test_game(4, r, http_session))
+
+        log("\n" + "=" * 60)
+        log("=== ALL MULTI-PLAYER TESTS PASSED ===")
+        log("=" * 60)
+    finally:
+        flush_logs()
 
 
 if __name__ == "__main__":
@@ -12,120 +12,228 @@ Validates:
 
 Usage:
     python test_regression.py
+    REDIS_URL=redis://host:6379 python test_regression.py
+    REDIS_MOCK=1 python test_regression.py   # in-process fakeredis, no redis-server
+    python test_regression.py --with-wait    # then test_wait.py, same event loop
 """
 
 import asyncio
-import json
+import contextlib
+import contextvars
+import functools
+import itertools
 import os
 import random
 import sys
+import threading
+import time
 import uuid
+from collections.abc import Sequence
 
 import aiohttp
 import redis.asyncio as aioredis
-from mcp.client.session import ClientSession
-from mcp.client.stdio import StdioServerParameters, stdio_client
+from redis.commands.core import AsyncScript
+
+import mcp_player
+from mcp_player import redis_url_env
+
+try:
+    import orjson as _json  # optional: faster state encode/decode
+except ImportError:
+    import json as _json
 
-PYTHON = sys.executable
-MAIN_PY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
 COLORS = ["Red", "Yellow", "Green", "Blue"]
 PORT_MAP = {"A": 19000, "B": 19001}
+# Every distinct card -> (color, value); wilds map to ("Wild", "Wild")
+CARD_INFO = {
+    f"{color} {value}": (color, value)
+    for color in COLORS
+    for value in [str(n) for n in range(10)] + ["Skip", "Reverse", "Draw Two"]
+}
+CARD_INFO["Wild"] = CARD_INFO["Wild Draw Four"] = ("Wild", "Wild")
+# Tests run concurrently, so every other server process gets its own web port
+_SPARE_PORTS = itertools.count(19300)
+# Set UNO_TEST_SEED to replay the same wild-colour picks in the full games
+_SEED = os.environ.get("UNO_TEST_SEED")
+DECK_SIZE = 108
+# Full-game turn cap: two turns per card in the deck
+MAX_TURNS = 2 * DECK_SIZE
+
+
+# Set while a test runs under run_concurrently: its lines are held back and
+# written as one block when it finishes, so concurrent output doesn't interleave
+_TEST_LOG: contextvars.ContextVar[list[str] | None] = contextvars.ContextVar(
+    "_TEST_LOG", default=None
+)
 
 
 def log(msg: str) -> None:
+    test_log = _TEST_LOG.get()
+    if test_log is not None:
+        test_log.append(msg)
+        return
     print(msg, flush=True)
 
 
-def extract_text(result) -> str:
-    return result.content[0].text
+def parse_status_line(status_text: str) -> str:
+    for line in status_text.splitlines():
+        if line.startswith("Status: "):
+            return line[len("Status: "):]
+    return ""
 
 
-def parse_hand_from_status(status_text: str) -> list[str]:
-    cards = []
+def parse_status(status_text: str) -> tuple[str, list[str], str, str]:
+    """Return (status line, hand, top card, current color) in one pass."""
+    status = top = color = ""
+    hand = []
     in_hand = False
     for line in status_text.splitlines():
-        if line.strip() == "=== Your Hand ===":
+        stripped = line.strip()
+        if stripped == "=== Your Hand ===":
             in_hand = True
             continue
-        if line.strip() == "" and in_hand:
-            break
         if in_hand:
-            parts = line.strip().split(". ", 1)
+            if not stripped:
+                in_hand = False
+                continue
+            parts = stripped.split(". ", 1)
             if len(parts) == 2:
-                cards.append(parts[1])
-    return cards
+                hand.append(parts[1])
+            continue
+        if line.startswith("Status: "):
+            status = line[len("Status: "):]
+        elif line.startswith("Top card: "):
+            top = line[len("Top card: "):]
+        elif line.startswith("Current color: "):
+            color = line[len("Current color: "):]
+    return status, hand, top, color
+
+
+class MCPPlayer(mcp_player.MCPPlayer):
+    async def start(self, game_id: str, player: str, port: int | None = None) -> None:
+        port = port or next(_SPARE_PORTS)
+        await super().start(game_id, player, f"--port={port}", env=redis_url_env())
+
+
+class MCPPlayerPool:
+    """Long-lived A/B server pairs shared by the controlled-state tests.
+
+    Each pair serves its own game id. The server re-reads the game from
+    Redis on every tool call, so a test checks out a pair, seeds that
+    game's state key and hands the pair back, instead of spawning two fresh
+    processes.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._pairs: list[tuple[str, MCPPlayer, MCPPlayer]] = []
+        self._idle: asyncio.Queue[tuple[str, MCPPlayer, MCPPlayer]] = asyncio.Queue()
+
+    async def start(self) -> None:
+        async with asyncio.TaskGroup() as tg:
+            for n in range(self.size):
+                game_id = f"reg_pool{n}_{uuid.uuid4().hex[:8]}"
+                pa = MCPPlayer("A")
+                pb = MCPPlayer("B")
+                self._pairs.append((f"uno:{game_id}", pa, pb))
+                tg.create_task(pa.start(game_id, "A"))
+                tg.create_task(pb.start(game_id, "B"))
+        for pair in self._pairs:
+            self._idle.put_nowait(pair)
 
+    async def stop(self) -> None:
+        players = [p for _, pa, pb in self._pairs for p in (pa, pb)]
+        await asyncio.gather(*(p.stop() for p in players), return_exceptions=True)
 
-def parse_status_line(status_text: str) -> str:
-    for line in status_text.splitlines():
-        if line.startswith("Status: "):
-            return line[len("Status: "):]
-    return ""
+    @contextlib.asynccontextmanager
+    async def acquire(self):
+        """Yield (state_key, pa, pb) for exclusive use until the block exits."""
+        pair = await self._idle.get()
+        try:
+            yield pair
+        finally:
+            self._idle.put_nowait(pair)
 
 
-class MCPPlayer:
-    def __init__(self, name: str):
-        self.name = name
-        self._stdio_cm = None
-        self._session_cm = None
-        self.session: ClientSession | None = None
-
-    async def start(self, game_id: str, player: str) -> None:
-        params = StdioServerParameters(
-            command=PYTHON,
-            args=[MAIN_PY, f"--game={game_id}", f"--player={player}"],
-        )
-        self._stdio_cm = stdio_client(params)
-        read_stream, write_stream = await self._stdio_cm.__aenter__()
-        self._session_cm = ClientSession(read_stream, write_stream)
-        self.session = await self._session_cm.__aenter__()
-        await self.session.initialize()
+COUNT_CARDS_LUA = """
+local s = cjson.decode(redis.call('GET', KEYS[1]))
+local t = #s.draw_pile + #s.discard_pile
+for _, p in ipairs(ARGV) do t = t + #s.hands[p] end
+return t
+"""
 
-    async def stop(self) -> None:
-        if self._session_cm:
-            await self._session_cm.__aexit__(None, None, None)
-        if self._stdio_cm:
-            await self._stdio_cm.__aexit__(None, None, None)
-
-    async def call(self, tool: str, arguments: dict | None = None) -> tuple[str, bool]:
-        result = await self.session.call_tool(tool, arguments or {})
-        text = extract_text(result)
-        is_err = getattr(result, "isError", False)
-        return text, is_err
-
-
-async def count_total_cards(r, game_id, player_ids=("A", "B")):
-    """Return total cards in the game."""
-    raw = await r.get(f"uno:{game_id}")
-    state = json.loads(raw)
+
+async def register_count_script(r: aioredis.Redis) -> AsyncScript | None:
+    """Load COUNT_CARDS_LUA, or return None if the server has no scripting
+    (e.g. fakeredis without lupa)."""
+    try:
+        # Load up front: the first EVALSHA then hits the script cache
+        # instead of going through a NOSCRIPT reply and a retry
+        await r.script_load(COUNT_CARDS_LUA)
+    except aioredis.ResponseError:
+        # fakeredis closes the connection after an unknown command; drop
+        # it here so the next command doesn't pick it up from the pool
+        await r.connection_pool.disconnect()
+        return None
+    return r.register_script(COUNT_CARDS_LUA)
+
+
+async def count_total_cards(r, count_script, state_key, player_ids=("A", "B")):
+    """Return total cards in the game.
+
+    Counted server-side by count_script when there is one, else by GET +
+    decode.
+    """
+    if count_script is not None:
+        return await count_script(keys=[state_key], args=list(player_ids))
+    state = _json.loads(await r.get(state_key))
     total = sum(len(state["hands"][p]) for p in player_ids)
     total += len(state["draw_pile"]) + len(state["discard_pile"])
     return total
 
 
-async def verify_card_conservation(r, game_id, expected, player_ids=("A", "B")):
+async def verify_card_conservation(r, count_script, state_key, expected,
+                                   player_ids=("A", "B")):
     """Verify total cards equals expected value."""
-    total = await count_total_cards(r, game_id, player_ids)
+    total = await count_total_cards(r, count_script, state_key, player_ids)
     assert total == expected, f"Card conservation violated: {total} != {expected}"
 
 
-# ---------------------------------------------------------------------------
-# Test 1: Controlled 2-player game — Skip card
-# ---------------------------------------------------------------------------
-async def test_skip_2p():
-    log("\n--- Test: Skip in 2-player ---")
-    game_id = f"reg_skip_{uuid.uuid4().hex[:8]}"
-    r = aioredis.Redis(decode_responses=True)
-    await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
+async def wait_ready(http: aiohttp.ClientSession, ports, deadline: float = 2.0) -> None:
+    """Poll GET / on each port until all answer 200, backing off with jitter.
+
+    Gives up silently after `deadline` seconds; the caller's own requests
+    then report the failure.
+    """
+    start = time.monotonic()
+    delay = 0.01
+
+    async def probe(port):
+        url = f"http://localhost:{port}/"
+        async with http.get(url, timeout=aiohttp.ClientTimeout(total=0.2)) as resp:
+            return resp.status
+
+    while time.monotonic() - start < deadline:
+        results = await asyncio.gather(*map(probe, ports), return_exceptions=True)
+        if all(status == 200 for status in results):
+            return
+        await asyncio.sleep(delay + random.uniform(0, delay))
+        delay = min(delay * 2, 0.1)
+
+
+# Filler draw piles (80 number cards of one colour), built once at import as
+# tuples; seed_state only serializes them, so tests can share them safely.
+FILLER_PILES = {color: tuple(f"{color} {i}" for i in range(10)) * 8 for color in COLORS}
+# test_draw_2p: Yellow 9 is the next card drawn
+DRAW_TEST_PILE = FILLER_PILES["Green"][:70] + ("Yellow 9",)
 
-    deck = [f"Red {i}" for i in range(10)] * 10
-    state = {
-        "draw_pile": deck[:80],
+
+def make_state(draw_pile: Sequence[str], a_hand: list[str], b_hand: list[str]) -> dict:
+    """Controlled 2-player state: Red 5 on the discard pile, A to play."""
+    return {
+        "draw_pile": draw_pile,
         "discard_pile": ["Red 5"],
-        "hands": {
-            "A": ["Red Skip", "Blue 3", "Green 7", "Yellow 1", "Red 2", "Blue 8", "Green 4"],
-            "B": ["Red 1", "Blue 2", "Green 3", "Yellow 4", "Red 6", "Blue 7", "Green 8"],
-        },
+        "hands": {"A": a_hand, "B": b_hand},
         "current_turn": "A",
         "current_color": "Red",
         "last_action": "Game started",
@@ -133,363 +241,247 @@ async def test_skip_2p():
         "player_order": ["A", "B"],
         "direction": 1,
     }
-    await r.set(f"uno:{game_id}", json.dumps(state))
 
-    pa = MCPPlayer("A")
-    pb = MCPPlayer("B")
-    try:
-        await pa.start(game_id, "A")
-        await pb.start(game_id, "B")
+
+async def seed_state(r, state_key, state):
+    """Replace the game's state (and drop any stale lock) in one round trip."""
+    async with r.pipeline(transaction=False) as pipe:
+        pipe.delete(state_key, f"{state_key}:lock")
+        pipe.set(state_key, _json.dumps(state))
+        await pipe.execute()
+
+
+async def cleanup_all(r, batch: int = 500):
+    """Unlink every regression-test key (all game ids start with "reg_").
+
+    Runs once at the end of the suite instead of a DEL per test; UNLINK
+    frees the values in the background on the Redis side.
+    """
+    keys = [k async for k in r.scan_iter(match="uno:reg_*", count=batch)]
+    if keys:
+        async with r.pipeline(transaction=False) as pipe:
+            for i in range(0, len(keys), batch):
+                pipe.unlink(*keys[i:i + batch])
+            await pipe.execute()
+
+
+# ---------------------------------------------------------------------------
+# Test 1: Controlled 2-player game — Skip card
+# ---------------------------------------------------------------------------
+async def test_skip_2p(r: aioredis.Redis, pool: MCPPlayerPool,
+                       count_script: AsyncScript | None):
+    log("\n--- Test: Skip in 2-player ---")
+
+    state = make_state(
+        FILLER_PILES["Red"],
+        a_hand=["Red Skip", "Blue 3", "Green 7", "Yellow 1", "Red 2", "Blue 8", "Green 4"],
+        b_hand=["Red 1", "Blue 2", "Green 3", "Yellow 4", "Red 6", "Blue 7", "Green 8"],
+    )
+    async with pool.acquire() as (state_key, pa, pb):
+        await seed_state(r, state_key, state)
 
         # Player A plays Skip → keeps turn (B is skipped)
         text, err = await pa.call("play", {"card": "Red Skip"})
         assert not err, f"Error: {text}"
         assert "B is skipped" in text, f"Expected 'B is skipped' in: {text}"
 
-        raw = await r.get(f"uno:{game_id}")
-        s = json.loads(raw)
+        raw = await r.get(state_key)
+        s = _json.loads(raw)
         assert s["current_turn"] == "A", f"After Skip, should be A's turn, got {s['current_turn']}"
         assert len(s["hands"]["A"]) == 6, "A should have 6 cards after playing Skip"
 
-        await verify_card_conservation(r, game_id, expected=95)
+        await verify_card_conservation(r, count_script, state_key, expected=95)
         log("  PASS: Skip gives A another turn, B skipped.")
-    finally:
-        await pb.stop()
-        await pa.stop()
-        await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
-        await r.close()
 
 
 # ---------------------------------------------------------------------------
 # Test 2: Controlled 2-player game — Reverse card (acts as Skip in 2p)
 # ---------------------------------------------------------------------------
-async def test_reverse_2p():
+async def test_reverse_2p(r: aioredis.Redis, pool: MCPPlayerPool,
+                          count_script: AsyncScript | None):
     log("\n--- Test: Reverse in 2-player (should act as Skip) ---")
-    game_id = f"reg_rev_{uuid.uuid4().hex[:8]}"
-    r = aioredis.Redis(decode_responses=True)
-    await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
-
-    state = {
-        "draw_pile": [f"Red {i}" for i in range(10)] * 8,
-        "discard_pile": ["Red 5"],
-        "hands": {
-            "A": ["Red Reverse", "Blue 3", "Green 7", "Yellow 1", "Red 2", "Blue 8", "Green 4"],
-            "B": ["Red 1", "Blue 2", "Green 3", "Yellow 4", "Red 6", "Blue 7", "Green 8"],
-        },
-        "current_turn": "A",
-        "current_color": "Red",
-        "last_action": "Game started",
-        "winner": None,
-        "player_order": ["A", "B"],
-        "direction": 1,
-    }
-    await r.set(f"uno:{game_id}", json.dumps(state))
 
-    pa = MCPPlayer("A")
-    pb = MCPPlayer("B")
-    try:
-        await pa.start(game_id, "A")
-        await pb.start(game_id, "B")
+    state = make_state(
+        FILLER_PILES["Red"],
+        a_hand=["Red Reverse", "Blue 3", "Green 7", "Yellow 1", "Red 2", "Blue 8", "Green 4"],
+        b_hand=["Red 1", "Blue 2", "Green 3", "Yellow 4", "Red 6", "Blue 7", "Green 8"],
+    )
+    async with pool.acquire() as (state_key, pa, pb):
+        await seed_state(r, state_key, state)
 
         text, err = await pa.call("play", {"card": "Red Reverse"})
         assert not err, f"Error: {text}"
         assert "B is skipped" in text, f"Expected 'B is skipped' in: {text}"
 
-        raw = await r.get(f"uno:{game_id}")
-        s = json.loads(raw)
+        raw = await r.get(state_key)
+        s = _json.loads(raw)
         assert s["current_turn"] == "A", f"After Reverse (2p), should be A's turn, got {s['current_turn']}"
         # Direction should NOT change in 2-player Reverse
         assert s["direction"] == 1, f"Direction should stay 1 in 2p Reverse, got {s['direction']}"
 
-        await verify_card_conservation(r, game_id, expected=95)
+        await verify_card_conservation(r, count_script, state_key, expected=95)
         log("  PASS: Reverse acts as Skip in 2-player, direction unchanged.")
-    finally:
-        await pb.stop()
-        await pa.stop()
-        await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
-        await r.close()
 
 
 # ---------------------------------------------------------------------------
 # Test 3: Draw Two in 2-player
 # ---------------------------------------------------------------------------
-async def test_draw_two_2p():
+async def test_draw_two_2p(r: aioredis.Redis, pool: MCPPlayerPool,
+                           count_script: AsyncScript | None):
     log("\n--- Test: Draw Two in 2-player ---")
-    game_id = f"reg_d2_{uuid.uuid4().hex[:8]}"
-    r = aioredis.Redis(decode_responses=True)
-    await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
-
-    state = {
-        "draw_pile": [f"Yellow {i}" for i in range(10)] * 8,
-        "discard_pile": ["Red 5"],
-        "hands": {
-            "A": ["Red Draw Two", "Blue 3", "Green 7", "Yellow 1", "Red 2", "Blue 8", "Green 4"],
-            "B": ["Red 1", "Blue 2", "Green 3", "Yellow 4", "Red 6", "Blue 7", "Green 8"],
-        },
-        "current_turn": "A",
-        "current_color": "Red",
-        "last_action": "Game started",
-        "winner": None,
-        "player_order": ["A", "B"],
-        "direction": 1,
-    }
-    await r.set(f"uno:{game_id}", json.dumps(state))
 
-    pa = MCPPlayer("A")
-    pb = MCPPlayer("B")
-    try:
-        await pa.start(game_id, "A")
-        await pb.start(game_id, "B")
+    state = make_state(
+        FILLER_PILES["Yellow"],
+        a_hand=["Red Draw Two", "Blue 3", "Green 7", "Yellow 1", "Red 2", "Blue 8", "Green 4"],
+        b_hand=["Red 1", "Blue 2", "Green 3", "Yellow 4", "Red 6", "Blue 7", "Green 8"],
+    )
+    async with pool.acquire() as (state_key, pa, pb):
+        await seed_state(r, state_key, state)
 
         text, err = await pa.call("play", {"card": "Red Draw Two"})
         assert not err, f"Error: {text}"
         assert "B draws 2 and is skipped" in text, f"Unexpected: {text}"
 
-        raw = await r.get(f"uno:{game_id}")
-        s = json.loads(raw)
+        raw = await r.get(state_key)
+        s = _json.loads(raw)
         assert s["current_turn"] == "A", f"After Draw Two (2p), should be A's turn, got {s['current_turn']}"
         assert len(s["hands"]["B"]) == 9, f"B should have 9 cards (7+2), got {len(s['hands']['B'])}"
         assert len(s["hands"]["A"]) == 6, f"A should have 6 cards, got {len(s['hands']['A'])}"
 
-        await verify_card_conservation(r, game_id, expected=95)
+        await verify_card_conservation(r, count_script, state_key, expected=95)
         log("  PASS: Draw Two — B draws 2, B is skipped, A keeps turn.")
-    finally:
-        await pb.stop()
-        await pa.stop()
-        await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
-        await r.close()
 
 
 # ---------------------------------------------------------------------------
 # Test 4: Wild Draw Four in 2-player
 # ---------------------------------------------------------------------------
-async def test_wild_draw_four_2p():
+async def test_wild_draw_four_2p(r: aioredis.Redis, pool: MCPPlayerPool,
+                                 count_script: AsyncScript | None):
     log("\n--- Test: Wild Draw Four in 2-player ---")
-    game_id = f"reg_wd4_{uuid.uuid4().hex[:8]}"
-    r = aioredis.Redis(decode_responses=True)
-    await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
 
-    state = {
-        "draw_pile": [f"Green {i}" for i in range(10)] * 8,
-        "discard_pile": ["Red 5"],
-        "hands": {
-            "A": ["Wild Draw Four", "Blue 3", "Green 7", "Yellow 1", "Red 2", "Blue 8", "Green 4"],
-            "B": ["Red 1", "Blue 2", "Green 3", "Yellow 4", "Red 6", "Blue 7", "Green 8"],
-        },
-        "current_turn": "A",
-        "current_color": "Red",
-        "last_action": "Game started",
-        "winner": None,
-        "player_order": ["A", "B"],
-        "direction": 1,
-    }
-    await r.set(f"uno:{game_id}", json.dumps(state))
-
-    pa = MCPPlayer("A")
-    pb = MCPPlayer("B")
-    try:
-        await pa.start(game_id, "A")
-        await pb.start(game_id, "B")
+    state = make_state(
+        FILLER_PILES["Green"],
+        a_hand=["Wild Draw Four", "Blue 3", "Green 7", "Yellow 1", "Red 2", "Blue 8", "Green 4"],
+        b_hand=["Red 1", "Blue 2", "Green 3", "Yellow 4", "Red 6", "Blue 7", "Green 8"],
+    )
+    async with pool.acquire() as (state_key, pa, pb):
+        await seed_state(r, state_key, state)
 
         text, err = await pa.call("play", {"card": "Wild Draw Four", "chosen_color": "Blue"})
         assert not err, f"Error: {text}"
         assert "B draws 4 and is skipped" in text, f"Unexpected: {text}"
         assert "Color is now Blue" in text, f"Expected color change in: {text}"
 
-        raw = await r.get(f"uno:{game_id}")
-        s = json.loads(raw)
+        raw = await r.get(state_key)
+        s = _json.loads(raw)
         assert s["current_turn"] == "A", f"After WD4 (2p), should be A's turn, got {s['current_turn']}"
         assert len(s["hands"]["B"]) == 11, f"B should have 11 cards (7+4), got {len(s['hands']['B'])}"
         assert s["current_color"] == "Blue", f"Color should be Blue, got {s['current_color']}"
 
-        await verify_card_conservation(r, game_id, expected=95)
+        await verify_card_conservation(r, count_script, state_key, expected=95)
         log("  PASS: Wild Draw Four — B draws 4, B skipped, color changed.")
-    finally:
-        await pb.stop()
-        await pa.stop()
-        await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
-        await r.close()
 
 
 # ---------------------------------------------------------------------------
 # Test 5: Wild card (no draw) in 2-player
 # ---------------------------------------------------------------------------
-async def test_wild_2p():
+async def test_wild_2p(r: aioredis.Redis, pool: MCPPlayerPool,
+                       count_script: AsyncScript | None):
     log("\n--- Test: Wild card in 2-player ---")
-    game_id = f"reg_w_{uuid.uuid4().hex[:8]}"
-    r = aioredis.Redis(decode_responses=True)
-    await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
 
-    state = {
-        "draw_pile": [f"Green {i}" for i in range(10)] * 8,
-        "discard_pile": ["Red 5"],
-        "hands": {
-            "A": ["Wild", "Blue 3", "Green 7", "Yellow 1", "Red 2", "Blue 8", "Green 4"],
-            "B": ["Red 1", "Blue 2", "Green 3", "Yellow 4", "Red 6", "Blue 7", "Green 8"],
-        },
-        "current_turn": "A",
-        "current_color": "Red",
-        "last_action": "Game started",
-        "winner": None,
-        "player_order": ["A", "B"],
-        "direction": 1,
-    }
-    await r.set(f"uno:{game_id}", json.dumps(state))
-
-    pa = MCPPlayer("A")
-    pb = MCPPlayer("B")
-    try:
-        await pa.start(game_id, "A")
-        await pb.start(game_id, "B")
+    state = make_state(
+        FILLER_PILES["Green"],
+        a_hand=["Wild", "Blue 3", "Green 7", "Yellow 1", "Red 2", "Blue 8", "Green 4"],
+        b_hand=["Red 1", "Blue 2", "Green 3", "Yellow 4", "Red 6", "Blue 7", "Green 8"],
+    )
+    async with pool.acquire() as (state_key, pa, pb):
+        await seed_state(r, state_key, state)
 
         text, err = await pa.call("play", {"card": "Wild", "chosen_color": "Green"})
         assert not err, f"Error: {text}"
         assert "Color is now Green" in text, f"Expected color change in: {text}"
 
-        raw = await r.get(f"uno:{game_id}")
-        s = json.loads(raw)
+        raw = await r.get(state_key)
+        s = _json.loads(raw)
         # Wild does NOT skip — turn passes to opponent
         assert s["current_turn"] == "B", f"After Wild (2p), should be B's turn, got {s['current_turn']}"
         assert s["current_color"] == "Green", f"Color should be Green, got {s['current_color']}"
 
-        await verify_card_conservation(r, game_id, expected=95)
+        await verify_card_conservation(r, count_script, state_key, expected=95)
         log("  PASS: Wild — turn passes to B, color changed.")
-    finally:
-        await pb.stop()
-        await pa.stop()
-        await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
-        await r.close()
 
 
 # ---------------------------------------------------------------------------
 # Test 6: Normal number card in 2-player
 # ---------------------------------------------------------------------------
-async def test_number_2p():
+async def test_number_2p(r: aioredis.Redis, pool: MCPPlayerPool,
+                         count_script: AsyncScript | None):
     log("\n--- Test: Number card in 2-player ---")
-    game_id = f"reg_num_{uuid.uuid4().hex[:8]}"
-    r = aioredis.Redis(decode_responses=True)
-    await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
-
-    state = {
-        "draw_pile": [f"Green {i}" for i in range(10)] * 8,
-        "discard_pile": ["Red 5"],
-        "hands": {
-            "A": ["Red 3", "Blue 3", "Green 7", "Yellow 1", "Red 2", "Blue 8", "Green 4"],
-            "B": ["Red 1", "Blue 2", "Green 3", "Yellow 4", "Red 6", "Blue 7", "Green 8"],
-        },
-        "current_turn": "A",
-        "current_color": "Red",
-        "last_action": "Game started",
-        "winner": None,
-        "player_order": ["A", "B"],
-        "direction": 1,
-    }
-    await r.set(f"uno:{game_id}", json.dumps(state))
 
-    pa = MCPPlayer("A")
-    pb = MCPPlayer("B")
-    try:
-        await pa.start(game_id, "A")
-        await pb.start(game_id, "B")
+    state = make_state(
+        FILLER_PILES["Green"],
+        a_hand=["Red 3", "Blue 3", "Green 7", "Yellow 1", "Red 2", "Blue 8", "Green 4"],
+        b_hand=["Red 1", "Blue 2", "Green 3", "Yellow 4", "Red 6", "Blue 7", "Green 8"],
+    )
+    async with pool.acquire() as (state_key, pa, pb):
+        await seed_state(r, state_key, state)
 
         text, err = await pa.call("play", {"card": "Red 3"})
         assert not err, f"Error: {text}"
         assert text == "You played Red 3.", f"Unexpected message: {text}"
 
-        raw = await r.get(f"uno:{game_id}")
-        s = json.loads(raw)
+        raw = await r.get(state_key)
+        s = _json.loads(raw)
         assert s["current_turn"] == "B", f"After number card, should be B's turn, got {s['current_turn']}"
 
-        await verify_card_conservation(r, game_id, expected=95)
+        await verify_card_conservation(r, count_script, state_key, expected=95)
         log("  PASS: Number card — turn passes to B.")
-    finally:
-        await pb.stop()
-        await pa.stop()
-        await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
-        await r.close()
 
 
 # ---------------------------------------------------------------------------
 # Test 7: Draw card in 2-player
 # ---------------------------------------------------------------------------
-async def test_draw_2p():
+async def test_draw_2p(r: aioredis.Redis, pool: MCPPlayerPool):
     log("\n--- Test: Draw in 2-player ---")
-    game_id = f"reg_draw_{uuid.uuid4().hex[:8]}"
-    r = aioredis.Redis(decode_responses=True)
-    await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
-
-    state = {
-        "draw_pile": [f"Green {i}" for i in range(10)] * 7 + ["Yellow 9"],
-        "discard_pile": ["Red 5"],
-        "hands": {
-            "A": ["Blue 3", "Green 7", "Yellow 1", "Blue 8", "Green 4", "Blue 6", "Green 0"],
-            "B": ["Red 1", "Blue 2", "Green 3", "Yellow 4", "Red 6", "Blue 7", "Green 8"],
-        },
-        "current_turn": "A",
-        "current_color": "Red",
-        "last_action": "Game started",
-        "winner": None,
-        "player_order": ["A", "B"],
-        "direction": 1,
-    }
-    await r.set(f"uno:{game_id}", json.dumps(state))
 
-    pa = MCPPlayer("A")
-    pb = MCPPlayer("B")
-    try:
-        await pa.start(game_id, "A")
-        await pb.start(game_id, "B")
+    state = make_state(
+        DRAW_TEST_PILE,
+        a_hand=["Blue 3", "Green 7", "Yellow 1", "Blue 8", "Green 4", "Blue 6", "Green 0"],
+        b_hand=["Red 1", "Blue 2", "Green 3", "Yellow 4", "Red 6", "Blue 7", "Green 8"],
+    )
+    async with pool.acquire() as (state_key, pa, pb):
+        await seed_state(r, state_key, state)
 
         text, err = await pa.call("draw")
         assert not err, f"Error: {text}"
         assert "You drew: Yellow 9" in text, f"Unexpected: {text}"
 
-        raw = await r.get(f"uno:{game_id}")
-        s = json.loads(raw)
+        raw = await r.get(state_key)
+        s = _json.loads(raw)
         assert s["current_turn"] == "B", f"After draw, should be B's turn, got {s['current_turn']}"
         assert len(s["hands"]["A"]) == 8, f"A should have 8 cards (7+1), got {len(s['hands']['A'])}"
 
         log("  PASS: Draw — turn passes to B, A gets 1 card.")
-    finally:
-        await pb.stop()
-        await pa.stop()
-        await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
-        await r.close()
 
 
 # ---------------------------------------------------------------------------
 # Test 8: Status format is exactly correct for 2-player
 # ---------------------------------------------------------------------------
-async def test_status_format_2p():
+async def test_status_format_2p(r: aioredis.Redis, pool: MCPPlayerPool):
     log("\n--- Test: Status output format for 2-player ---")
-    game_id = f"reg_fmt_{uuid.uuid4().hex[:8]}"
-    r = aioredis.Redis(decode_responses=True)
-    await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
 
-    state = {
-        "draw_pile": [f"Green {i}" for i in range(10)] * 8,
-        "discard_pile": ["Red 5"],
-        "hands": {
-            "A": ["Red 3", "Blue 3"],
-            "B": ["Red 1", "Blue 2", "Green 3"],
-        },
-        "current_turn": "A",
-        "current_color": "Red",
-        "last_action": "Game started",
-        "winner": None,
-        "player_order": ["A", "B"],
-        "direction": 1,
-    }
-    await r.set(f"uno:{game_id}", json.dumps(state))
+    state = make_state(
+        FILLER_PILES["Green"],
+        a_hand=["Red 3", "Blue 3"],
+        b_hand=["Red 1", "Blue 2", "Green 3"],
+    )
+    async with pool.acquire() as (state_key, pa, pb):
+        await seed_state(r, state_key, state)
 
-    pa = MCPPlayer("A")
-    pb = MCPPlayer("B")
-    try:
-        await pa.start(game_id, "A")
-        await pb.start(game_id, "B")
+        # Both views are read-only; fetch them together
+        (text_a, _), (text_b, _) = await asyncio.gather(pa.call("status"), pb.call("status"))
 
         # Check A's status
-        text_a, _ = await pa.call("status")
         lines_a = text_a.splitlines()
         assert "Opponent has: 3 cards" in lines_a, f"Expected 'Opponent has: 3 cards', got: {lines_a}"
         assert "Status: YOUR TURN" in lines_a, f"Expected YOUR TURN in A's status"
@@ -500,31 +492,22 @@ async def test_status_format_2p():
             "Should use 'Opponent has:' not 'Player X has:' in 2-player"
 
         # Check B's status
-        text_b, _ = await pb.call("status")
         lines_b = text_b.splitlines()
         assert "Opponent has: 2 cards" in lines_b, f"Expected 'Opponent has: 2 cards', got: {lines_b}"
         assert "Status: OPPONENT'S TURN" in lines_b, f"Expected OPPONENT'S TURN in B's status"
 
         log("  PASS: 2-player status format is correct (Opponent, no Direction).")
-    finally:
-        await pb.stop()
-        await pa.stop()
-        await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
-        await r.close()
 
 
 # ---------------------------------------------------------------------------
 # Test 9: Old game state migration (missing player_order/direction)
 # ---------------------------------------------------------------------------
-async def test_old_state_migration():
+async def test_old_state_migration(r: aioredis.Redis, pool: MCPPlayerPool):
     log("\n--- Test: Old game state migration ---")
-    game_id = f"reg_old_{uuid.uuid4().hex[:8]}"
-    r = aioredis.Redis(decode_responses=True)
-    await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
 
     # Simulate an old game state WITHOUT player_order and direction
     old_state = {
-        "draw_pile": [f"Green {i}" for i in range(10)] * 8,
+        "draw_pile": FILLER_PILES["Green"],
         "discard_pile": ["Red 5"],
         "hands": {
             "A": ["Red 3", "Blue 3", "Green 7", "Yellow 1", "Red 2", "Blue 8", "Green 4"],
@@ -536,13 +519,8 @@ async def test_old_state_migration():
         "winner": None,
         # NOTE: no player_order, no direction
     }
-    await r.set(f"uno:{game_id}", json.dumps(old_state))
-
-    pa = MCPPlayer("A")
-    pb = MCPPlayer("B")
-    try:
-        await pa.start(game_id, "A")
-        await pb.start(game_id, "B")
+    async with pool.acquire() as (state_key, pa, pb):
+        await seed_state(r, state_key, old_state)
 
         # Status should work (migration fills in defaults)
         text_a, err = await pa.call("status")
@@ -561,11 +539,6 @@ async def test_old_state_migration():
         assert "YOUR TURN" in text_b, f"Expected B's turn after A played"
 
         log("  PASS: Old game state (no player_order/direction) works via migration.")
-    finally:
-        await pb.stop()
-        await pa.stop()
-        await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
-        await r.close()
 
 
 # ---------------------------------------------------------------------------
@@ -574,19 +547,19 @@ async def test_old_state_migration():
 async def test_web_server_2p():
     log("\n--- Test: Web server during 2-player game ---")
     game_id = f"reg_web_{uuid.uuid4().hex[:8]}"
-    r = aioredis.Redis(decode_responses=True)
-    await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
 
     pa = MCPPlayer("A")
     pb = MCPPlayer("B")
     try:
-        await pa.start(game_id, "A")
-        await pb.start(game_id, "B")
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(pa.start(game_id, "A", PORT_MAP["A"]))
+            tg.create_task(pb.start(game_id, "B", PORT_MAP["B"]))
 
-        # Give web servers a moment to start
-        await asyncio.sleep(0.5)
+        # One keep-alive session for the readiness poll and every probe
+        connector = aiohttp.TCPConnector(limit=8, keepalive_timeout=30)
+        async with aiohttp.ClientSession(connector=connector) as http:
+            await wait_ready(http, PORT_MAP.values())
 
-        async with aiohttp.ClientSession() as http:
             for pid, port in [("A", 19000), ("B", 19001)]:
                 url = f"http://localhost:{port}/"
                 async with http.get(url, timeout=aiohttp.ClientTimeout(total=5)) as resp:
@@ -598,56 +571,35 @@ async def test_web_server_2p():
                     assert "Your Hand" in body, f"Missing hand section"
                     log(f"  Player {pid} web server at :{port} OK")
 
-        # Now play a card via MCP and verify web server still works
-        status_a, _ = await pa.call("status")
-        sl = parse_status_line(status_a)
-        if sl == "YOUR TURN":
-            await pa.call("draw")
-        else:
-            await pb.call("draw")
+            # Now play a card via MCP and verify web server still works
+            status_a, _ = await pa.call("status")
+            sl = parse_status_line(status_a)
+            if sl == "YOUR TURN":
+                await pa.call("draw")
+            else:
+                await pb.call("draw")
 
-        async with aiohttp.ClientSession() as http:
             async with http.get("http://localhost:19000/", timeout=aiohttp.ClientTimeout(total=5)) as resp:
                 assert resp.status == 200, "Web server broke after MCP action"
 
         log("  PASS: Web servers work correctly alongside MCP.")
     finally:
-        await pb.stop()
-        await pa.stop()
-        await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
-        await r.close()
+        await asyncio.gather(pa.stop(), pb.stop(), return_exceptions=True)
 
 
 # ---------------------------------------------------------------------------
 # Test 11: Wait tool still works in 2-player
 # ---------------------------------------------------------------------------
-async def test_wait_2p():
+async def test_wait_2p(r: aioredis.Redis, pool: MCPPlayerPool):
     log("\n--- Test: Wait tool in 2-player ---")
-    game_id = f"reg_wait_{uuid.uuid4().hex[:8]}"
-    r = aioredis.Redis(decode_responses=True)
-    await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
-
-    state = {
-        "draw_pile": [f"Green {i}" for i in range(10)] * 8,
-        "discard_pile": ["Red 5"],
-        "hands": {
-            "A": ["Red 3", "Blue 3", "Green 7", "Yellow 1", "Red 2", "Blue 8", "Green 4"],
-            "B": ["Red 1", "Blue 2", "Green 3", "Yellow 4", "Red 6", "Blue 7", "Green 8"],
-        },
-        "current_turn": "A",
-        "current_color": "Red",
-        "last_action": "Game started",
-        "winner": None,
-        "player_order": ["A", "B"],
-        "direction": 1,
-    }
-    await r.set(f"uno:{game_id}", json.dumps(state))
 
-    pa = MCPPlayer("A")
-    pb = MCPPlayer("B")
-    try:
-        await pa.start(game_id, "A")
-        await pb.start(game_id, "B")
+    state = make_state(
+        FILLER_PILES["Green"],
+        a_hand=["Red 3", "Blue 3", "Green 7", "Yellow 1", "Red 2", "Blue 8", "Green 4"],
+        b_hand=["Red 1", "Blue 2", "Green 3", "Yellow 4", "Red 6", "Blue 7", "Green 8"],
+    )
+    async with pool.acquire() as (state_key, pa, pb):
+        await seed_state(r, state_key, state)
 
         # Wait when it's already your turn — should return immediately
         text, err = await pa.call("wait", {"timeout": 5})
@@ -663,53 +615,29 @@ async def test_wait_2p():
         assert "Player A played Red 3" in text, f"Expected last action, got: {text}"
 
         log("  PASS: Wait tool works correctly in 2-player.")
-    finally:
-        await pb.stop()
-        await pa.stop()
-        await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
-        await r.close()
 
 
 # ---------------------------------------------------------------------------
 # Test 12: Win detection in 2-player
 # ---------------------------------------------------------------------------
-async def test_win_2p():
+async def test_win_2p(r: aioredis.Redis, pool: MCPPlayerPool):
     log("\n--- Test: Win detection in 2-player ---")
-    game_id = f"reg_win_{uuid.uuid4().hex[:8]}"
-    r = aioredis.Redis(decode_responses=True)
-    await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
-
-    state = {
-        "draw_pile": [f"Green {i}" for i in range(10)] * 8,
-        "discard_pile": ["Red 5"],
-        "hands": {
-            "A": ["Red 3"],  # Only 1 card — playing it wins
-            "B": ["Red 1", "Blue 2", "Green 3"],
-        },
-        "current_turn": "A",
-        "current_color": "Red",
-        "last_action": "Game started",
-        "winner": None,
-        "player_order": ["A", "B"],
-        "direction": 1,
-    }
-    await r.set(f"uno:{game_id}", json.dumps(state))
 
-    pa = MCPPlayer("A")
-    pb = MCPPlayer("B")
-    try:
-        await pa.start(game_id, "A")
-        await pb.start(game_id, "B")
+    state = make_state(
+        FILLER_PILES["Green"],
+        a_hand=["Red 3"],  # Only 1 card — playing it wins
+        b_hand=["Red 1", "Blue 2", "Green 3"],
+    )
+    async with pool.acquire() as (state_key, pa, pb):
+        await seed_state(r, state_key, state)
 
         text, err = await pa.call("play", {"card": "Red 3"})
         assert not err, f"Error: {text}"
         assert "You win" in text, f"Expected win message, got: {text}"
 
         # Check statuses
-        text_a, _ = await pa.call("status")
+        (text_a, _), (text_b, _) = await asyncio.gather(pa.call("status"), pb.call("status"))
         assert "YOU WON!" in text_a, f"A should see YOU WON!, got: {parse_status_line(text_a)}"
-
-        text_b, _ = await pb.call("status")
         assert "OPPONENT WON!" in text_b, f"B should see OPPONENT WON!, got: {parse_status_line(text_b)}"
 
         # Game should be over — further plays should error
@@ -718,95 +646,109 @@ async def test_win_2p():
         assert "already over" in text.lower(), f"Expected 'already over', got: {text}"
 
         log("  PASS: Win detection and game-over state correct.")
-    finally:
-        await pb.stop()
-        await pa.stop()
-        await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
-        await r.close()
 
 
 # ---------------------------------------------------------------------------
 # Test 13: Run multiple full 2-player games (exercise randomness)
 # ---------------------------------------------------------------------------
-async def test_full_games_2p(num_games: int = 3):
-    log(f"\n--- Test: {num_games} full 2-player games ---")
+async def play_full_game(r: aioredis.Redis, i: int, rng: random.Random) -> None:
+    """Play one 2-player game on fresh servers and validate its end state."""
+    game_id = f"reg_full_{i}_{uuid.uuid4().hex[:8]}"
+    state_key = f"uno:{game_id}"
 
-    for i in range(num_games):
-        game_id = f"reg_full_{i}_{uuid.uuid4().hex[:8]}"
-        r = aioredis.Redis(decode_responses=True)
-        await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
+    pa = MCPPlayer("A")
+    pb = MCPPlayer("B")
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(pa.start(game_id, "A"))
+            tg.create_task(pb.start(game_id, "B"))
+
+        players = {"A": pa, "B": pb}
+        opponent = {"A": "B", "B": "A"}
+        # Local mirror of the game, kept up to date from the play/draw
+        # responses. A hand is (re)read with status only when it gains
+        # cards we can't see: at the start, or after a Draw Two/WD4 hit.
+        hands: dict[str, list[str] | None] = {"A": None, "B": None}
+        text_a, _ = await pa.call("status")
+        sl, hands["A"], top, color = parse_status(text_a)
+        cur_id = "A" if sl == "YOUR TURN" else "B"
+        turn_count = 0
+
+        while turn_count < MAX_TURNS:
+            turn_count += 1
+            cur = players[cur_id]
+            if hands[cur_id] is None:
+                st, _ = await cur.call("status")
+                _, hands[cur_id], top, color = parse_status(st)
+            hand = hands[cur_id]
+
+            # Try to play
+            played = None
+            top_value = CARD_INFO[top][1]
+            for card in hand:
+                card_color, card_value = CARD_INFO[card]
+                wild = card_color == "Wild"
+                if wild or card_color == color or card_value == top_value:
+                    args = {"card": card}
+                    if wild:
+                        args["chosen_color"] = rng.choice(COLORS)
+                    text, err = await cur.call("play", args)
+                    assert not err, f"Error playing {card}: {text}"
+                    played = card
+                    hand.remove(card)
+                    top = card
+                    color = args.get("chosen_color", card_color)
+                    break
 
-        pa = MCPPlayer("A")
-        pb = MCPPlayer("B")
-        try:
-            await pa.start(game_id, "A")
-            await pb.start(game_id, "B")
+            if played is None:
+                text, err = await cur.call("draw")
+                assert not err, f"Error drawing: {text}"
+                hand.append(text.removeprefix("You drew: "))
+                cur_id = opponent[cur_id]
+            else:
+                if played == "Wild Draw Four" or played.endswith(" Draw Two"):
+                    # The victim draws cards we don't see, even on a winning play
+                    hands[opponent[cur_id]] = None
+                elif not played.endswith((" Skip", " Reverse")):
+                    # 2-player: action cards keep the turn, others pass it
+                    cur_id = opponent[cur_id]
+                if "You win" in text:
+                    break
 
-            players = {"A": pa, "B": pb}
-            turn_count = 0
+        # Validate final state
+        raw = await r.get(state_key)
+        s = _json.loads(raw)
+        total = len(s["hands"]["A"]) + len(s["hands"]["B"]) + len(s["draw_pile"]) + len(s["discard_pile"])
+        assert total == DECK_SIZE, f"Game {i}: card conservation violated: {total}"
 
-            while turn_count < 300:
-                turn_count += 1
+        if s["winner"]:
+            assert len(s["hands"][s["winner"]]) == 0, f"Game {i}: winner should have 0 cards"
 
-                # Determine whose turn from A's perspective
-                text_a, _ = await pa.call("status")
-                sl = parse_status_line(text_a)
+        for pid, hand in hands.items():
+            if hand is not None:
+                assert hand == s["hands"][pid], f"Game {i}: tracked hand for {pid} drifted from Redis"
 
-                if sl in ("YOU WON!", "OPPONENT WON!"):
-                    break
+        log(f"  Game {i+1}: {turn_count} turns, winner={'Player ' + s['winner'] if s['winner'] else 'none (limit)'}")
+    finally:
+        await asyncio.gather(pa.stop(), pb.stop(), return_exceptions=True)
 
-                cur_id = "A" if sl == "YOUR TURN" else "B"
-                cur = players[cur_id]
 
-                st, _ = await cur.call("status")
-                hand = parse_hand_from_status(st)
-                top = ""
-                color = ""
-                for line in st.splitlines():
-                    if line.startswith("Top card: "):
-                        top = line[len("Top card: "):]
-                    if line.startswith("Current color: "):
-                        color = line[len("Current color: "):]
-
-                # Try to play
-                played = False
-                for card in hand:
-                    wild = card in ("Wild", "Wild Draw Four")
-                    if wild:
-                        can_play = True
-                    else:
-                        parts = card.split(" ", 1)
-                        tparts = top.split(" ", 1)
-                        can_play = (len(parts) >= 2 and len(tparts) >= 2 and
-                                    (parts[0] == color or parts[1] == tparts[1]))
-                    if can_play:
-                        args = {"card": card}
-                        if wild:
-                            args["chosen_color"] = random.choice(COLORS)
-                        text, err = await cur.call("play", args)
-                        assert not err, f"Error playing {card}: {text}"
-                        played = True
-                        break
-
-                if not played:
-                    text, err = await cur.call("draw")
-                    assert not err, f"Error drawing: {text}"
-
-            # Validate final state
-            raw = await r.get(f"uno:{game_id}")
-            s = json.loads(raw)
-            total = len(s["hands"]["A"]) + len(s["hands"]["B"]) + len(s["draw_pile"]) + len(s["discard_pile"])
-            assert total == 108, f"Game {i}: card conservation violated: {total}"
-
-            if s["winner"]:
-                assert len(s["hands"][s["winner"]]) == 0, f"Game {i}: winner should have 0 cards"
-
-            log(f"  Game {i+1}: {turn_count} turns, winner={'Player ' + s['winner'] if s['winner'] else 'none (limit)'}")
-        finally:
-            await pb.stop()
-            await pa.stop()
-            await r.delete(f"uno:{game_id}", f"uno:{game_id}:lock")
-            await r.close()
+async def test_full_games_2p(r: aioredis.Redis, num_games: int = 3, parallel: int = 2):
+    log(f"\n--- Test: {num_games} full 2-player games ---")
+
+    # Each game has its own id and spare web ports, so the next game's
+    # servers can start while the previous one is still playing/stopping
+    sem = asyncio.Semaphore(parallel)
+
+    async def bounded(i):
+        # Games overlap, so each draws from its own stream for the seed to replay
+        rng = random.Random(f"{_SEED}:{i}") if _SEED is not None else random.Random()
+        async with sem:
+            await play_full_game(r, i, rng)
+
+    async with asyncio.TaskGroup() as tg:
+        for i in range(num_games):
+            tg.create_task(bounded(i))
 
     log(f"  PASS: All {num_games} full 2-player games valid.")
 
@@ -814,25 +756,107 @@ async def test_full_games_2p(num_games: int = 3):
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
+def start_fake_redis() -> str:
+    """Serve an in-process fakeredis over TCP and return its URL.
+
+    The servers under test are subprocesses, so they can't share a
+    FakeRedis object; the TCP front end lets them and this script use
+    the same fake instance. Requires the optional fakeredis package.
+    """
+    from fakeredis import TcpFakeServer
+
+    server = TcpFakeServer(("127.0.0.1", 0), server_type="redis")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    return f"redis://{host}:{port}"
+
+
+def redis_client() -> aioredis.Redis:
+    """Client for REDIS_URL if set (as main.py does), else localhost.
+
+    Replies stay as bytes: state blobs go straight into _json.loads and
+    scanned keys straight back into UNLINK, so decoding them is wasted work.
+    """
+    if redis_url := os.environ.get("REDIS_URL"):
+        return aioredis.from_url(redis_url, max_connections=16)
+    return aioredis.Redis(max_connections=16)
+
+
+async def run_concurrently(tests, limit: int = 6) -> None:
+    """Run independent tests side by side, at most `limit` at a time.
+
+    Each test uses its own game id (or pooled pair) and web ports, so they
+    don't interfere. A test's log is written as one block when it finishes,
+    and a failure cancels the rest before the caller's cleanup runs.
+    """
+    sem = asyncio.Semaphore(limit)
+
+    async def run(test):
+        async with sem:
+            test_log: list[str] = []
+            token = _TEST_LOG.set(test_log)
+            try:
+                await test()
+            finally:
+                _TEST_LOG.reset(token)
+                for line in test_log:
+                    log(line)
+
+    async with asyncio.TaskGroup() as tg:
+        for test in tests:
+            tg.create_task(run(test))
+
+
 async def main():
-    await test_skip_2p()
-    await test_reverse_2p()
-    await test_draw_two_2p()
-    await test_wild_draw_four_2p()
-    await test_wild_2p()
-    await test_number_2p()
-    await test_draw_2p()
-    await test_status_format_2p()
-    await test_old_state_migration()
-    await test_web_server_2p()
-    await test_wait_2p()
-    await test_win_2p()
-    await test_full_games_2p(3)
+    # One client (and connection pool) shared by every test
+    async with redis_client() as r:
+        count_script = await register_count_script(r)
+        pool = MCPPlayerPool(4)
+        try:
+            await pool.start()
+            counted = [
+                test_skip_2p,
+                test_reverse_2p,
+                test_draw_two_2p,
+                test_wild_draw_four_2p,
+                test_wild_2p,
+                test_number_2p,
+            ]
+            pooled = [
+                test_draw_2p,
+                test_status_format_2p,
+                test_old_state_migration,
+                test_wait_2p,
+                test_win_2p,
+            ]
+            await run_concurrently(
+                [functools.partial(test, r, pool, count_script) for test in counted]
+                + [functools.partial(test, r, pool) for test in pooled]
+                # These need the server's own startup (fixed ports, a fresh deal)
+                + [test_web_server_2p, functools.partial(test_full_games_2p, r)]
+            )
+        finally:
+            await pool.stop()
+            await cleanup_all(r)
 
     log("\n" + "=" * 60)
     log("=== ALL REGRESSION TESTS PASSED ===")
     log("=" * 60)
 
 
+def run_all() -> None:
+    """Run this suite and test_wait.py back to back on one event loop."""
+    import test_wait
+
+    with asyncio.Runner() as runner:
+        runner.run(main())
+        runner.run(test_wait.main())
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    if os.environ.get("REDIS_MOCK") == "1":
+        os.environ["REDIS_URL"] = start_fake_redis()
+    if "--with-wait" in sys.argv[1:]:
+        run_all()
+    else:
+        asyncio.run(main())